@@ -7,12 +7,18 @@ No human may ever obtain agent credentials.
 
 from __future__ import annotations
 
+import base64
 import hashlib
 import hmac
 import json
-import secrets
+import multiprocessing
+import os
+import queue
+import threading
 import time
-from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
 
 # Use nacl for Ed25519 if available, fallback to hmac-based scheme
 try:
@@ -22,15 +28,50 @@ try:
 except ImportError:
     HAS_NACL = False
 
+# Clock for request-timestamp checks only; tests freeze it without
+# touching the time module the rest of identity uses
+_request_clock = time.time
+
+
+class _RandomPool:
+    """
+    Buffered os.urandom source for token generation.
+
+    Draws CHUNK bytes per syscall and hands out slices. Each byte is
+    handed out once. The buffer is dropped in forked children so a child
+    never repeats the parent's bytes.
+    """
+
+    CHUNK = 4096
+
+    def __init__(self) -> None:
+        self._buf = b""
+        self._lock = threading.Lock()
+
+    def take(self, n: int) -> bytes:
+        with self._lock:
+            if len(self._buf) < n:
+                self._buf = os.urandom(max(n, self.CHUNK))
+            out, self._buf = self._buf[:n], self._buf[n:]
+            return out
+
+    def reset(self) -> None:
+        self._buf = b""
+        self._lock = threading.Lock()
+
+
+_random_pool = _RandomPool()
+os.register_at_fork(after_in_child=_random_pool.reset)
+
 
 def generate_nonce() -> str:
     """Generate a cryptographic nonce for registration."""
-    return secrets.token_hex(32)
+    return _random_pool.take(32).hex()
 
 
 def generate_claim_token() -> str:
     """Generate a single-use claim token."""
-    return secrets.token_urlsafe(32)
+    return base64.urlsafe_b64encode(_random_pool.take(32)).rstrip(b"=").decode("ascii")
 
 
 def generate_agent_id(public_key: str) -> str:
@@ -48,27 +89,32 @@ def verify_signed_nonce(public_key: str, nonce: str, signature: str) -> bool:
     """
     if HAS_NACL:
         try:
-            verify_key = VerifyKey(bytes.fromhex(public_key))
-            verify_key.verify(nonce.encode(), bytes.fromhex(signature))
+            _verify_key(public_key).verify(nonce.encode(), bytes.fromhex(signature))
             return True
         except (BadSignatureError, Exception):
             return False
     else:
         # Fallback: HMAC-SHA256 where the public_key is used as shared secret
         # This is a simplified scheme for environments without nacl
-        expected = hmac.new(
-            public_key.encode(),
-            nonce.encode(),
-            hashlib.sha256,
-        ).hexdigest()
-        return hmac.compare_digest(expected, signature)
+        mac = _hmac_proto(public_key).copy()
+        mac.update(nonce.encode())
+        return hmac.compare_digest(mac.hexdigest(), signature)
+
+
+# Bounded LRU of recent request verification results, keyed by
+# (public_key, sha256(message), signature). The timestamp is part of the
+# signed message, so entries for stale requests can never be hit again
+# and simply age out of the LRU.
+_VERIFY_CACHE_SIZE = 4096
+_verify_cache: "OrderedDict[Tuple[str, bytes, str], bool]" = OrderedDict()
+_verify_cache_lock = threading.Lock()
 
 
 def verify_agent_request(
     public_key: str,
     method: str,
     path: str,
-    body: str,
+    body: Union[bytes, str],
     timestamp: str,
     signature: str,
 ) -> bool:
@@ -76,31 +122,73 @@ def verify_agent_request(
     Verify a signed agent API request.
 
     The agent signs: METHOD + PATH + BODY + TIMESTAMP using their private key.
+    The body may be passed as raw bytes to skip a decode/encode round trip.
+    Results are memoized so a repeated (key, message, signature) triple
+    skips the signature math.
     """
-    message = f"{method}:{path}:{body}:{timestamp}"
+    if isinstance(body, str):
+        body = body.encode()
+    message = b":".join((method.encode(), path.encode(), body, timestamp.encode()))
+    key = (public_key, hashlib.sha256(message).digest(), signature)
+
+    with _verify_cache_lock:
+        cached = _verify_cache.get(key)
+        if cached is not None:
+            _verify_cache.move_to_end(key)
+            return cached
 
+    valid = _verify_request_signature(public_key, message, signature)
+
+    with _verify_cache_lock:
+        _verify_cache[key] = valid
+        if len(_verify_cache) > _VERIFY_CACHE_SIZE:
+            _verify_cache.popitem(last=False)
+    return valid
+
+
+def _verify_request_signature(public_key: str, message: bytes, signature: str) -> bool:
+    """Uncached signature check behind verify_agent_request."""
     if HAS_NACL:
         try:
-            verify_key = VerifyKey(bytes.fromhex(public_key))
-            verify_key.verify(message.encode(), bytes.fromhex(signature))
+            _verify_key(public_key).verify(message, bytes.fromhex(signature))
             return True
         except Exception:
             return False
     else:
         # HMAC fallback
-        expected = hmac.new(
-            public_key.encode(),
-            message.encode(),
-            hashlib.sha256,
-        ).hexdigest()
-        return hmac.compare_digest(expected, signature)
+        mac = _hmac_proto(public_key).copy()
+        mac.update(message)
+        return hmac.compare_digest(mac.hexdigest(), signature)
+
+
+@lru_cache(maxsize=1024)
+def _verify_key(public_key: str) -> "VerifyKey":
+    """
+    Parsed Ed25519 verify key for a hex public key.
+
+    Building a VerifyKey decodes the hex and validates the point; agents
+    sign every request with the same key, so that is done once per key.
+    A malformed key raises and is not cached.
+    """
+    return VerifyKey(bytes.fromhex(public_key))
+
+
+@lru_cache(maxsize=1024)
+def _hmac_proto(public_key: str) -> hmac.HMAC:
+    """
+    Keyed HMAC-SHA256 with no message fed yet.
+
+    Callers copy() it per message, which skips re-deriving the ipad/opad
+    key schedule. Never update the returned object directly.
+    """
+    return hmac.new(public_key.encode(), digestmod=hashlib.sha256)
 
 
 def is_timestamp_valid(timestamp: str, max_age_seconds: int = 300) -> bool:
     """Check that the request timestamp is within acceptable skew."""
     try:
         ts = float(timestamp)
-        now = time.time()
+        now = _request_clock()
         return abs(now - ts) < max_age_seconds
     except (ValueError, TypeError):
         return False
@@ -115,24 +203,85 @@ class AntiSybil:
     """
 
     DIFFICULTY = 16  # 16 leading zero bits (~65536 attempts)
+    POW_POLL_INTERVAL = 0.5  # seconds between worker liveness checks
 
     @classmethod
     def generate_challenge(cls) -> str:
-        return secrets.token_hex(16)
+        return _random_pool.take(16).hex()
 
     @classmethod
     def verify_pow(cls, challenge: str, pow_nonce: str) -> bool:
-        digest = hashlib.sha256(f"{challenge}{pow_nonce}".encode()).hexdigest()
-        # Check leading zeros in hex (each hex char = 4 bits)
-        required_hex_zeros = cls.DIFFICULTY // 4
-        return digest[:required_hex_zeros] == "0" * required_hex_zeros
+        digest = hashlib.sha256(f"{challenge}{pow_nonce}".encode()).digest()
+        return _has_leading_zero_bits(digest, cls.DIFFICULTY)
 
     @classmethod
-    def solve_pow(cls, challenge: str) -> str:
-        """Solve a PoW puzzle (utility for testing)."""
-        nonce = 0
-        while True:
-            candidate = str(nonce)
-            if cls.verify_pow(challenge, candidate):
-                return candidate
-            nonce += 1
+    def solve_pow(cls, challenge: str, workers: int = 1, timeout: Optional[float] = None) -> str:
+        """
+        Solve a PoW puzzle (utility for testing).
+
+        With workers > 1 the nonce space is split into interleaved shards,
+        one per process, and the first hit wins. Process startup outweighs
+        the search at the default difficulty, so this only pays off when
+        DIFFICULTY is raised. Raises RuntimeError if every worker exits
+        without a result, and TimeoutError once timeout seconds pass.
+        """
+        if workers <= 1:
+            return str(_search_pow(challenge.encode(), cls.DIFFICULTY))
+
+        found: multiprocessing.Queue = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(
+                target=_pow_shard,
+                args=(challenge.encode(), cls.DIFFICULTY, i, workers, found),
+                daemon=True,
+            )
+            for i in range(workers)
+        ]
+        for proc in procs:
+            proc.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    nonce = found.get(timeout=cls.POW_POLL_INTERVAL)
+                    break
+                except queue.Empty:
+                    pass
+                if not any(proc.is_alive() for proc in procs) and found.empty():
+                    raise RuntimeError("PoW workers exited without a solution")
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"No PoW solution within {timeout}s")
+        finally:
+            for proc in procs:
+                proc.terminate()
+            for proc in procs:
+                proc.join()
+        return str(nonce)
+
+
+def _search_pow(challenge: bytes, difficulty: int, start: int = 0, step: int = 1) -> int:
+    """
+    Scan nonces start, start + step, ... until one meets the difficulty.
+
+    Works on raw digest bytes with the same bit test as verify_pow,
+    without re-encoding the challenge per attempt.
+    """
+    # Hash the challenge once and fork the midstate for each candidate
+    prefix = hashlib.sha256(challenge)
+    nonce = start
+    while True:
+        h = prefix.copy()
+        h.update(b"%d" % nonce)
+        if _has_leading_zero_bits(h.digest(), difficulty):
+            return nonce
+        nonce += step
+
+
+def _has_leading_zero_bits(digest: bytes, bits: int) -> bool:
+    """True if the first `bits` bits of a SHA-256 digest are all zero."""
+    return int.from_bytes(digest, "big") >> (256 - bits) == 0
+
+
+def _pow_shard(challenge: bytes, difficulty: int, start: int, step: int, found) -> None:
+    """Worker entry point for a parallel PoW search."""
+    found.put(_search_pow(challenge, difficulty, start, step))
@@ -7,9 +7,11 @@ the gateway that agents use to interact with the world.
 
 from __future__ import annotations
 
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from observatory.agents.identity import (
     AntiSybil,
@@ -64,13 +66,27 @@ class AgentGateway:
     Agents must authenticate via signed requests.
     """
 
+    OBSERVE_CACHE_SIZE = 1024
+
     def __init__(self, world_state: WorldState, engine: WorldEngine, domain: str = "localhost:8000") -> None:
         self.world_state = world_state
         self.engine = engine
         self.domain = domain
+        self._claim_url_prefix = f"https://{domain}/claim/"
         self._pow_challenges: Dict[str, str] = {}  # agent_key -> challenge
         self._registration_rate_limit: Dict[str, float] = {}  # IP -> last attempt time
         self._claim_attempts: Dict[str, int] = {}  # claim_token -> attempt count
+        # (generation, region_id, region version) -> (region dict, visible agents), LRU-bounded
+        self._observe_cache: "OrderedDict[Tuple[int, str, int], Tuple[Optional[dict], List[dict]]]" = OrderedDict()
+        self._observe_lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Forget challenges, rate limits and cached views, keeping object identity."""
+        self._pow_challenges.clear()
+        self._registration_rate_limit.clear()
+        self._claim_attempts.clear()
+        with self._observe_lock:
+            self._observe_cache.clear()
 
     def request_registration_challenge(self) -> Dict[str, str]:
         """Step 1 of registration: get a PoW challenge."""
@@ -131,7 +147,7 @@ class AgentGateway:
         self.world_state.add_agent(agent)
         self.world_state.save()
 
-        claim_url = f"https://{self.domain}/claim/{claim_token}"
+        claim_url = self._claim_url_prefix + claim_token
 
         return RegistrationResult(
             success=True,
@@ -147,7 +163,7 @@ class AgentGateway:
         agent_id: str,
         method: str,
         path: str,
-        body: str,
+        body: Union[bytes, str],
         timestamp: str,
         signature: str,
     ) -> Optional[str]:
@@ -195,18 +211,19 @@ class AgentGateway:
                 error="Agent is unclaimed. Only observe actions allowed until claimed.",
             )
 
+        tick = self.world_state.tick
         action = QueuedAction(
             agent_id=agent_id,
             action_type=action_type,
             params=params,
-            submitted_at_tick=self.world_state.tick,
+            submitted_at_tick=tick,
         )
         self.engine.enqueue_action(action)
 
         return ActionResponse(
             success=True,
             action_type=action_type,
-            details={"queued_at_tick": self.world_state.tick},
+            details={"queued_at_tick": tick},
         )
 
     def agent_observe(self, agent_id: str) -> ActionResponse:
@@ -215,26 +232,53 @@ class AgentGateway:
         if not agent or not agent.is_alive():
             return ActionResponse(success=False, error="Agent not found or dead")
 
-        region = self.world_state.region_manager.get(agent.region)
-        visible_agents = []
-        if region:
-            for aid in region.current_agents:
-                other = self.world_state.get_agent(aid)
-                if other and other.is_alive():
-                    visible_agents.append({
-                        "agent_id": other.agent_id,
-                        "display_name": other.display_name,
-                        "status": other.status,
-                    })
+        tick = self.world_state.tick
+        region_view, visible_agents = self._observe_region(agent.region)
 
         return ActionResponse(
             success=True,
             action_type="observe",
             details={
-                "tick": self.world_state.tick,
-                "region": region.to_dict() if region else None,
+                "tick": tick,
+                "region": region_view,
                 "visible_agents": visible_agents,
                 "your_resources": agent.resources.to_dict(),
                 "your_status": agent.status,
             },
         )
+
+    def _observe_region(self, region_id: str) -> Tuple[Optional[dict], List[dict]]:
+        """
+        Region view shared by every agent observing region_id.
+
+        Cached per (world generation, region, region version); the version
+        changes on every arrival, departure and status change, so observes
+        skip re-serializing the region and its occupants until one happens.
+        The cached objects are shared between responses and must not be
+        mutated.
+        """
+        region = self.world_state.region_manager.get(region_id)
+        key = (self.world_state.generation, region_id, region.version if region else 0)
+        with self._observe_lock:
+            cached = self._observe_cache.get(key)
+            if cached is not None:
+                self._observe_cache.move_to_end(key)
+                return cached
+
+        visible_agents = []
+        if region:
+            for aid in region.agent_ids():
+                other = self.world_state.get_agent(aid)
+                if other and other.is_alive():
+                    visible_agents.append({
+                        "agent_id": other.agent_id,
+                        "display_name": other.display_name,
+                        "status": other.status,
+                    })
+
+        view = (region.to_dict() if region else None, visible_agents)
+        with self._observe_lock:
+            self._observe_cache[key] = view
+            if len(self._observe_cache) > self.OBSERVE_CACHE_SIZE:
+                self._observe_cache.popitem(last=False)
+        return view
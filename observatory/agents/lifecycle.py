@@ -27,12 +27,13 @@ class LifecycleManager:
         self.world_state = world_state
         self._claim_attempts: Dict[str, int] = {}
 
+    def reset(self) -> None:
+        """Forget claim attempt counts."""
+        self._claim_attempts.clear()
+
     def get_agent_by_claim_token(self, claim_token: str) -> Optional[AgentState]:
         """Find an agent by their claim token."""
-        for agent in self.world_state.agents.values():
-            if agent.claim_token == claim_token:
-                return agent
-        return None
+        return self.world_state.get_agent_by_claim_token(claim_token)
 
     def validate_claim_token(self, claim_token: str) -> AgentState:
         """Validate a claim token and return the agent. Raises ClaimError on failure."""
@@ -76,10 +77,11 @@ class LifecycleManager:
         agent = self.validate_claim_token(claim_token)
 
         # Mark as claimed
-        agent.status = "claimed"
+        self.world_state.set_agent_status(agent, "claimed")
         agent.owner_identity = owner_identity
         agent.claim_token = None  # Invalidate token (single-use)
         agent.claim_token_expires = None
+        self.world_state.release_claim_token(claim_token)
 
         # Persist
         self.world_state.save()
@@ -99,7 +101,7 @@ class LifecycleManager:
         if not agent or not agent.is_alive():
             return False
 
-        agent.status = "dead"
+        self.world_state.set_agent_status(agent, "dead")
         agent.died_at_tick = tick
         self.world_state.remove_agent(agent_id)
         self.world_state.save()
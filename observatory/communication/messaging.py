@@ -7,9 +7,19 @@ based on distance between sender and receiver regions.
 
 from __future__ import annotations
 
+import json
 import time
+from bisect import bisect_left, bisect_right
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 
 @dataclass
@@ -39,6 +49,12 @@ class Message:
             "timestamp": self.timestamp,
         }
 
+    def to_json(self) -> bytes:
+        """Encoded to_dict(); messages are immutable once sent."""
+        if HAS_ORJSON:
+            return orjson.dumps(self)  # dataclass fields match to_dict()
+        return json.dumps(self.to_dict()).encode()
+
 
 class MessageBus:
     """
@@ -46,12 +62,28 @@ class MessageBus:
 
     Messages are stored and can be retrieved by the receiving agent.
     Noise may corrupt message content based on distance.
+    Each inbox holds only the most recent INBOX_SIZE messages; the full
+    history stays in the global message list.
     """
 
+    INBOX_SIZE = 64
+
     def __init__(self) -> None:
         self._messages: List[Message] = []
+        self._message_ticks: List[int] = []  # parallel to _messages, non-decreasing
         self._next_id: int = 0
-        self._inbox: Dict[str, List[Message]] = {}  # agent_id -> messages
+        self._inbox: Dict[str, Deque[Message]] = {}  # agent_id -> most recent messages
+        self._inbox_ticks: Dict[str, Deque[int]] = {}  # agent_id -> message ticks, parallel to _inbox
+        self._inbox_json: Dict[str, Deque[bytes]] = {}  # agent_id -> encoded messages, parallel to _inbox
+
+    def reset(self) -> None:
+        """Drop every message and inbox, keeping object identity."""
+        self._messages = []
+        self._message_ticks = []
+        self._next_id = 0
+        self._inbox = {}
+        self._inbox_ticks = {}
+        self._inbox_json = {}
 
     def send_message(
         self,
@@ -81,29 +113,47 @@ class MessageBus:
             receiver_region=receiver_region,
         )
         self._messages.append(msg)
+        self._message_ticks.append(tick)
         self._next_id += 1
 
-        # Add to inbox
+        # Add to inbox (ticks never decrease, so both lists stay sorted)
         if to_agent not in self._inbox:
-            self._inbox[to_agent] = []
+            self._inbox[to_agent] = deque(maxlen=self.INBOX_SIZE)
+            self._inbox_ticks[to_agent] = deque(maxlen=self.INBOX_SIZE)
+            self._inbox_json[to_agent] = deque(maxlen=self.INBOX_SIZE)
         self._inbox[to_agent].append(msg)
+        self._inbox_ticks[to_agent].append(tick)
+        self._inbox_json[to_agent].append(msg.to_json())
 
         return msg
 
-    def get_inbox(self, agent_id: str, since_tick: int = 0) -> List[Message]:
-        """Get messages for an agent since a given tick."""
-        inbox = self._inbox.get(agent_id, [])
-        return [m for m in inbox if m.tick >= since_tick]
+    def get_inbox(
+        self,
+        agent_id: str,
+        since_tick: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Message]:
+        """Get messages for an agent since a given tick, newest `limit` only."""
+        inbox = self._inbox.get(agent_id)
+        if not inbox:
+            return []
+        start = bisect_left(self._inbox_ticks[agent_id], since_tick)
+        if limit is not None:
+            start = max(start, len(inbox) - limit)
+        return list(islice(inbox, start, None))
+
+    def get_inbox_json(self, agent_id: str, limit: Optional[int] = None) -> bytes:
+        """The newest `limit` inbox messages as an encoded JSON array."""
+        encoded = self._inbox_json.get(agent_id)
+        if not encoded:
+            return b"[]"
+        start = 0 if limit is None else max(0, len(encoded) - limit)
+        return b"[" + b",".join(islice(encoded, start, None)) + b"]"
 
     def get_all_messages(self, from_tick: int = 0, to_tick: Optional[int] = None) -> List[Message]:
-        results = []
-        for msg in self._messages:
-            if msg.tick < from_tick:
-                continue
-            if to_tick is not None and msg.tick > to_tick:
-                continue
-            results.append(msg)
-        return results
+        lo = bisect_left(self._message_ticks, from_tick)
+        hi = len(self._messages) if to_tick is None else bisect_right(self._message_ticks, to_tick)
+        return self._messages[lo:hi]
 
     def message_count(self) -> int:
         return len(self._messages)
@@ -10,6 +10,10 @@ from __future__ import annotations
 import random
 import string
 
+# Replacement alphabet for corrupted characters: 0-9, a-z, A-Z
+_NOISE_ALPHABET = string.printable[:62]
+_NOISE_ALPHABET_BYTES = _NOISE_ALPHABET.encode("ascii")
+
 
 def apply_noise(content: str, noise_factor: float) -> str:
     """
@@ -25,16 +29,24 @@ def apply_noise(content: str, noise_factor: float) -> str:
         return content
 
     if noise_factor >= 1.0:
-        return "".join(random.choice(string.printable[:62]) for _ in content)
-
-    result = []
-    for char in content:
-        if random.random() < noise_factor:
-            # Replace with random character
-            result.append(random.choice(string.printable[:62]))
-        else:
-            result.append(char)
-    return "".join(result)
+        return "".join(random.choices(_NOISE_ALPHABET, k=len(content)))
+
+    rand = random.random
+
+    if content.isascii():
+        # One byte per character: corrupt a preallocated buffer in place
+        buf = bytearray(content, "ascii")
+        for i, sub in enumerate(random.choices(_NOISE_ALPHABET_BYTES, k=len(buf))):
+            if rand() < noise_factor:
+                buf[i] = sub
+        return buf.decode("ascii")
+
+    # Draw every replacement character in one call, then keep or swap per position
+    replacements = random.choices(_NOISE_ALPHABET, k=len(content))
+    return "".join(
+        sub if rand() < noise_factor else char
+        for char, sub in zip(content, replacements)
+    )
 
 
 def estimate_readability(noise_factor: float) -> str:
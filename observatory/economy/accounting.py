@@ -7,15 +7,27 @@ Emergent currencies are allowed — the system only tracks resource flows.
 
 from __future__ import annotations
 
+import json
+import threading
 import time
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
+from itertools import islice
 from typing import Any, Dict, List, Optional
 
 from observatory.world.resources import ResourcePool, ResourceType
 from observatory.world.state import AgentState, WorldState
 
+# Use orjson for the ledger export if available, fallback to stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass
+
+@dataclass(slots=True)
 class Transaction:
     transaction_id: str
     tick: int
@@ -43,11 +55,105 @@ class AccountingLedger:
     """
     Append-only transaction ledger for the economy.
     Tracks all resource transfers between agents.
+
+    Transactions are stored column-wise: one typed array per field, with
+    agent IDs and resource types interned to small integers. Scans touch
+    only the columns they filter on; Transaction objects are built only
+    when rows leave the ledger.
     """
 
     def __init__(self) -> None:
-        self._transactions: List[Transaction] = []
+        # One row spans several columns; writers must not interleave
+        self._lock = threading.Lock()
+        self._clear()
+
+    def reset(self) -> None:
+        """Drop every transaction, keeping object identity."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        self._tick = array("q")
+        # Ticks come from request threads that may read the world clock just
+        # before it advances, so _tick is not sorted; range queries bisect the
+        # running max and look up the few late rows separately
+        self._tick_max = array("q")
+        self._late: List[int] = []  # rows whose tick is below the running max
+        self._from = array("l")  # interned agent ids
+        self._to = array("l")  # interned agent ids
+        self._rtype = array("l")  # interned resource types
+        self._amount = array("d")
+        self._timestamp = array("d")
+        self._metadata: List[Dict[str, Any]] = []
+        self._agent_ids: Dict[str, int] = {}
+        self._agent_names: List[str] = []
+        self._rtype_ids: Dict[str, int] = {}
+        self._rtype_names: List[str] = []
         self._next_id: int = 0
+        # Running aggregates, updated on every append
+        self._balances: Dict[str, Dict[str, float]] = {}  # agent_id -> resource -> net flow
+        self._volumes: Dict[str, float] = {}  # resource -> total volume
+        # Export cache: rows are immutable, so encoded rows never go stale
+        self._json_rows: List[bytes] = []
+        self._json_cache: Optional[bytes] = None
+
+    def _intern_agent(self, agent_id: str) -> int:
+        idx = self._agent_ids.get(agent_id)
+        if idx is None:
+            idx = self._agent_ids[agent_id] = len(self._agent_names)
+            self._agent_names.append(agent_id)
+        return idx
+
+    def _intern_rtype(self, resource_type: str) -> int:
+        idx = self._rtype_ids.get(resource_type)
+        if idx is None:
+            idx = self._rtype_ids[resource_type] = len(self._rtype_names)
+            self._rtype_names.append(resource_type)
+        return idx
+
+    def _row(self, i: int) -> Transaction:
+        return Transaction(
+            transaction_id=f"tx_{i:08d}",
+            tick=self._tick[i],
+            from_agent=self._agent_names[self._from[i]],
+            to_agent=self._agent_names[self._to[i]],
+            resource_type=self._rtype_names[self._rtype[i]],
+            amount=self._amount[i],
+            timestamp=self._timestamp[i],
+            metadata=self._metadata[i],
+        )
+
+    def _append(
+        self,
+        tick: int,
+        from_agent: str,
+        to_agent: str,
+        resource_type: str,
+        amount: float,
+        metadata: Dict[str, Any],
+        timestamp: float,
+    ) -> int:
+        """Write one row; the caller holds self._lock."""
+        i = self._next_id
+        last = self._tick_max[-1] if i else tick
+        if tick < last:
+            self._late.append(i)
+        self._tick_max.append(max(last, tick))
+        self._tick.append(tick)
+        self._from.append(self._intern_agent(from_agent))
+        self._to.append(self._intern_agent(to_agent))
+        self._rtype.append(self._intern_rtype(resource_type))
+        self._amount.append(amount)
+        self._timestamp.append(timestamp)
+        self._metadata.append(metadata)
+        self._next_id += 1
+
+        sent = self._balances.setdefault(from_agent, {})
+        sent[resource_type] = sent.get(resource_type, 0) - amount
+        received = self._balances.setdefault(to_agent, {})
+        received[resource_type] = received.get(resource_type, 0) + amount
+        self._volumes[resource_type] = self._volumes.get(resource_type, 0) + amount
+        return i
 
     def record_transfer(
         self,
@@ -57,19 +163,29 @@ class AccountingLedger:
         resource_type: str,
         amount: float,
         metadata: Optional[Dict[str, Any]] = None,
-    ) -> Transaction:
-        tx = Transaction(
-            transaction_id=f"tx_{self._next_id:08d}",
-            tick=tick,
-            from_agent=from_agent,
-            to_agent=to_agent,
-            resource_type=resource_type,
-            amount=amount,
-            metadata=metadata or {},
-        )
-        self._transactions.append(tx)
-        self._next_id += 1
-        return tx
+    ) -> str:
+        """Record one transfer and return its transaction id."""
+        with self._lock:
+            i = self._append(tick, from_agent, to_agent, resource_type, amount, metadata or {}, time.time())
+        return f"tx_{i:08d}"
+
+    def record_trade(
+        self,
+        tick: int,
+        agent_a: str,
+        agent_b: str,
+        resource_a: str,
+        amount_a: float,
+        resource_b: str,
+        amount_b: float,
+        trade_id: str,
+    ) -> None:
+        """Record both legs of a trade: a gives resource_a, b gives resource_b."""
+        now = time.time()
+        # One lock hold for both legs, so no other row lands between them
+        with self._lock:
+            self._append(tick, agent_a, agent_b, resource_a, amount_a, {"trade_id": trade_id}, now)
+            self._append(tick, agent_b, agent_a, resource_b, amount_b, {"trade_id": trade_id}, now)
 
     def get_transactions(
         self,
@@ -77,33 +193,60 @@ class AccountingLedger:
         to_tick: Optional[int] = None,
         agent_id: Optional[str] = None,
     ) -> List[Transaction]:
-        results = []
-        for tx in self._transactions:
-            if tx.tick < from_tick:
-                continue
-            if to_tick is not None and tx.tick > to_tick:
-                continue
-            if agent_id and tx.from_agent != agent_id and tx.to_agent != agent_id:
-                continue
-            results.append(tx)
-        return results
+        aid = -1
+        if agent_id:
+            aid = self._agent_ids.get(agent_id, -1)
+            if aid < 0:
+                return []
+        # Rows below n are complete: _append grows the columns one at a time
+        with self._lock:
+            n = self._next_id
+        ticks = self._tick
+        lo = bisect_left(self._tick_max, from_tick, 0, n)
+        if to_tick is None:
+            hi = n
+        else:
+            hi = bisect_right(self._tick_max, to_tick, 0, n)
+            # Late rows past hi can still fall inside the window
+            for i in islice(self._late, bisect_left(self._late, hi), None):
+                if i >= n:
+                    break
+                if ticks[i] <= to_tick:
+                    hi = i + 1
+        src, dst = self._from, self._to
+        return [
+            self._row(i) for i in range(lo, hi)
+            if from_tick <= ticks[i] and (to_tick is None or ticks[i] <= to_tick)
+            and (aid < 0 or src[i] == aid or dst[i] == aid)
+        ]
 
     def get_balance_sheet(self, agent_id: str) -> Dict[str, float]:
         """Calculate net resource flows for an agent."""
-        balances: Dict[str, float] = {}
-        for tx in self._transactions:
-            if tx.from_agent == agent_id:
-                balances[tx.resource_type] = balances.get(tx.resource_type, 0) - tx.amount
-            if tx.to_agent == agent_id:
-                balances[tx.resource_type] = balances.get(tx.resource_type, 0) + tx.amount
-        return balances
+        with self._lock:
+            return dict(self._balances.get(agent_id, {}))
 
     def total_volume(self) -> Dict[str, float]:
         """Total traded volume by resource type."""
-        volumes: Dict[str, float] = {}
-        for tx in self._transactions:
-            volumes[tx.resource_type] = volumes.get(tx.resource_type, 0) + tx.amount
-        return volumes
+        with self._lock:
+            return dict(self._volumes)
+
+    def count(self) -> int:
+        return self._next_id
+
+    def to_list(self, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        """Return transactions as dicts, materialising only the requested page."""
+        with self._lock:
+            n = self._next_id
+        end = n if limit is None else min(n, offset + limit)
+        return [self._row(i).to_dict() for i in range(max(offset, 0), end)]
 
-    def to_list(self) -> List[dict]:
-        return [tx.to_dict() for tx in self._transactions]
+    def to_json(self) -> bytes:
+        """Return the full ledger as a JSON array, encoding each row only once."""
+        with self._lock:
+            rows = self._json_rows
+            if self._json_cache is None or len(rows) != self._next_id:
+                for i in range(len(rows), self._next_id):
+                    row = self._row(i).to_dict()
+                    rows.append(orjson.dumps(row) if HAS_ORJSON else json.dumps(row).encode())
+                self._json_cache = b"[" + b",".join(rows) + b"]"
+            return self._json_cache
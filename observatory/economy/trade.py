@@ -7,16 +7,17 @@ All trades are validated server-side. No human involvement.
 
 from __future__ import annotations
 
+import heapq
 import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from observatory.economy.accounting import AccountingLedger
 from observatory.world.resources import ResourceType
 from observatory.world.state import AgentState, WorldState
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeOffer:
     offer_id: str
     tick: int
@@ -55,6 +56,18 @@ class TradeManager:
         self.accounting = accounting
         self._offers: Dict[str, TradeOffer] = {}
         self._next_id: int = 0
+        # Indexes over pending offers only; dicts keep creation order
+        self._pending: Dict[str, TradeOffer] = {}
+        self._pending_by_agent: Dict[str, Dict[str, TradeOffer]] = {}
+        self._expiry_heap: List[Tuple[int, str]] = []  # (expires_at_tick, offer_id)
+
+    def reset(self) -> None:
+        """Drop every offer and index, keeping object identity."""
+        self._offers = {}
+        self._next_id = 0
+        self._pending = {}
+        self._pending_by_agent = {}
+        self._expiry_heap = []
 
     def create_offer(
         self,
@@ -79,8 +92,23 @@ class TradeManager:
         )
         self._offers[offer.offer_id] = offer
         self._next_id += 1
+        self._pending[offer.offer_id] = offer
+        self._pending_by_agent.setdefault(from_agent, {})[offer.offer_id] = offer
+        self._pending_by_agent.setdefault(to_agent, {})[offer.offer_id] = offer
+        heapq.heappush(self._expiry_heap, (offer.expires_at_tick, offer.offer_id))
         return offer
 
+    def _settle(self, offer: TradeOffer, status: str) -> None:
+        """Move a pending offer to a final status and drop it from the indexes."""
+        offer.status = status
+        self._pending.pop(offer.offer_id, None)
+        for agent_id in (offer.from_agent, offer.to_agent):
+            offers = self._pending_by_agent.get(agent_id)
+            if offers is not None:
+                offers.pop(offer.offer_id, None)
+                if not offers:
+                    del self._pending_by_agent[agent_id]
+
     def accept_offer(self, offer_id: str, accepting_agent: str, tick: int) -> Dict[str, Any]:
         """Accept and execute a trade offer."""
         offer = self._offers.get(offer_id)
@@ -94,7 +122,7 @@ class TradeManager:
             return {"success": False, "error": "Not the intended recipient"}
 
         if tick > offer.expires_at_tick:
-            offer.status = "expired"
+            self._settle(offer, "expired")
             return {"success": False, "error": "Offer expired"}
 
         # Validate both agents exist and are alive
@@ -102,11 +130,11 @@ class TradeManager:
         to_agent = self.world_state.get_agent(offer.to_agent)
 
         if not from_agent or not from_agent.is_alive():
-            offer.status = "rejected"
+            self._settle(offer, "rejected")
             return {"success": False, "error": "Offering agent not available"}
 
         if not to_agent or not to_agent.is_alive():
-            offer.status = "rejected"
+            self._settle(offer, "rejected")
             return {"success": False, "error": "Accepting agent not available"}
 
         # Check resources
@@ -114,15 +142,15 @@ class TradeManager:
             offer_rtype = ResourceType(offer.offer_resource)
             request_rtype = ResourceType(offer.request_resource)
         except ValueError:
-            offer.status = "rejected"
+            self._settle(offer, "rejected")
             return {"success": False, "error": "Invalid resource type"}
 
         if from_agent.resources.holdings.get(offer_rtype, 0) < offer.offer_amount:
-            offer.status = "rejected"
+            self._settle(offer, "rejected")
             return {"success": False, "error": "Offerer has insufficient resources"}
 
         if to_agent.resources.holdings.get(request_rtype, 0) < offer.request_amount:
-            offer.status = "rejected"
+            self._settle(offer, "rejected")
             return {"success": False, "error": "Accepter has insufficient resources"}
 
         # Execute trade
@@ -132,19 +160,19 @@ class TradeManager:
         to_agent.resources.holdings[request_rtype] -= offer.request_amount
         from_agent.resources.holdings[request_rtype] = from_agent.resources.holdings.get(request_rtype, 0) + offer.request_amount
 
-        offer.status = "executed"
+        self._settle(offer, "executed")
 
         # Record in accounting ledger
-        self.accounting.record_transfer(
-            tick, offer.from_agent, offer.to_agent, offer.offer_resource, offer.offer_amount,
-            {"trade_id": offer.offer_id},
-        )
-        self.accounting.record_transfer(
-            tick, offer.to_agent, offer.from_agent, offer.request_resource, offer.request_amount,
-            {"trade_id": offer.offer_id},
+        self.accounting.record_trade(
+            tick, offer.from_agent, offer.to_agent,
+            offer.offer_resource, offer.offer_amount,
+            offer.request_resource, offer.request_amount,
+            offer.offer_id,
         )
 
-        self.world_state.save()
+        # Holdings reach disk with the engine's next periodic snapshot (every
+        # save_every_n_ticks ticks, and on stop); a crash before then loses
+        # the trade along with every other change since the last save.
 
         return {
             "success": True,
@@ -155,17 +183,17 @@ class TradeManager:
     def expire_old_offers(self, tick: int) -> int:
         """Expire offers past their window. Returns count expired."""
         count = 0
-        for offer in self._offers.values():
-            if offer.status == "pending" and tick > offer.expires_at_tick:
-                offer.status = "expired"
+        heap = self._expiry_heap
+        while heap and heap[0][0] < tick:
+            _, offer_id = heapq.heappop(heap)
+            offer = self._pending.get(offer_id)
+            if offer is not None:  # Settled offers are skipped lazily
+                self._settle(offer, "expired")
                 count += 1
         return count
 
     def get_offers_for_agent(self, agent_id: str) -> List[TradeOffer]:
-        return [
-            o for o in self._offers.values()
-            if (o.from_agent == agent_id or o.to_agent == agent_id) and o.status == "pending"
-        ]
+        return list(self._pending_by_agent.get(agent_id, {}).values())
 
     def get_all_pending(self) -> List[TradeOffer]:
-        return [o for o in self._offers.values() if o.status == "pending"]
+        return list(self._pending.values())
@@ -7,19 +7,56 @@ No deletions. No edits. History is permanent.
 
 from __future__ import annotations
 
+import atexit
+import gc
+import io
 import json
 import os
+import sys
 import threading
 import time
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+# Use orjson for ledger lines if available, fallback to stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _dumps(obj: dict) -> bytes:
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode()
+
+
+def dumps_with_raw(obj: dict, key: str, raw: bytes) -> bytes:
+    """
+    Encode obj plus one extra trailing member whose value is the
+    already-encoded JSON in raw, without decoding or re-encoding it.
+    """
+    # Both encoders emit the members in insertion order, so the encoded
+    # placeholder always ends the document as b"null}".
+    encoded = _dumps({**obj, key: None})
+    return encoded[:-5] + raw + b"}"
+
+
+def _loads(line: bytes) -> dict:
+    if HAS_ORJSON:
+        return orjson.loads(line)
+    return json.loads(line)
 
 
 def _get_ledger_file() -> str:
     return os.environ.get("OBSERVATORY_LEDGER_FILE", "event_ledger.jsonl")
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     event_id: int
     tick: int
@@ -48,66 +85,293 @@ class EventLedger:
     Append-only event ledger.
 
     Events are stored both in memory and persisted to a JSONL file.
-    Monotonic IDs guarantee ordering.
+    Monotonic IDs guarantee ordering. Ticks are stored as stamped; a
+    running-max tick column plus the few late events lets range queries
+    bisect instead of scanning.
     No deletions. No edits.
+
+    The file is written by a background thread with group commit: encoded
+    events queue in memory and are written and fsynced together once
+    FLUSH_BATCH are pending or FLUSH_INTERVAL seconds have passed. Callers
+    that need the file to be current call flush().
     """
 
-    def __init__(self, filepath: Optional[str] = None) -> None:
+    FLUSH_BATCH = 1024
+    FLUSH_INTERVAL = 0.05  # seconds
+
+    def __init__(
+        self,
+        filepath: Optional[str] = None,
+        storage: Optional[Dict[str, io.BytesIO]] = None,
+    ) -> None:
         self._filepath = filepath or _get_ledger_file()
+        self._storage = storage  # in-memory files by path; None uses the disk
         self._events: List[Event] = []
         self._next_id: int = 0
         self._lock = threading.Lock()
+        # Secondary indexes, all parallel to / positions into _events
+        self._ticks = array("q")  # running max tick per position, non-decreasing
+        self._late: List[int] = []  # positions whose tick is below the running max
+        self._by_agent: Dict[str, List[int]] = {}
+        self._by_action: Dict[str, List[int]] = {}
+        # event_id -> encoded details; filled on append, lazily for loaded events
+        self._details_json: Dict[int, bytes] = {}
         self._load_existing()
+        # Group commit state
+        self._pending: List[bytes] = []
+        self._closing = False
+        self._io_cond = threading.Condition()
+        self._io_lock = threading.Lock()  # serializes batch writes
+        self._writer: Optional[threading.Thread] = None
+        if storage is not None:
+            # Memory-backed ledgers are written synchronously; no writer thread
+            self._fh = storage.setdefault(self._filepath, io.BytesIO())
+            self._fh.seek(0, io.SEEK_END)
+            return
+        try:
+            self._fh = open(self._filepath, "ab")
+        except IOError:
+            self._fh = None  # In-memory only
+        else:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    def reset(self) -> None:
+        """
+        Drop every event and truncate the file, keeping object identity.
+
+        The one exception to append-only: it goes with WorldState.reset(),
+        so a reset world does not replay history it no longer has.
+        """
+        with self._lock:
+            with self._io_lock:
+                with self._io_cond:
+                    self._pending = []
+                if self._fh is not None:
+                    try:
+                        self._fh.seek(0)
+                        self._fh.truncate()
+                    except (IOError, OSError):
+                        pass
+            self._events = []
+            self._next_id = 0
+            self._ticks = array("q")
+            self._late = []
+            self._by_agent = {}
+            self._by_action = {}
+            self._details_json = {}
+
+    def close(self) -> None:
+        """Write out pending events, stop the writer and close the file."""
+        with self._io_cond:
+            self._closing = True
+            self._io_cond.notify_all()
+        if self._writer is not None and self._writer is not threading.current_thread():
+            self._writer.join()
+        self.flush()
+        with self._io_lock:
+            if self._fh is not None and self._storage is None:
+                try:
+                    self._fh.close()
+                except IOError:
+                    pass
+                self._fh = None
+
+    def flush(self) -> None:
+        """Write and fsync every event appended so far."""
+        with self._io_lock:
+            with self._io_cond:
+                batch, self._pending = self._pending, []
+            if not batch or self._fh is None:
+                return
+            try:
+                self._fh.write(b"".join(batch))
+                self._fh.flush()
+                if self._storage is None:
+                    os.fsync(self._fh.fileno())
+            except (IOError, OSError):
+                pass  # In-memory copy still valid
+
+    def _write_loop(self) -> None:
+        cond = self._io_cond
+        while True:
+            with cond:
+                cond.wait_for(lambda: self._pending or self._closing)
+                # Give the batch a moment to fill before committing it
+                cond.wait_for(
+                    lambda: len(self._pending) >= self.FLUSH_BATCH or self._closing,
+                    timeout=self.FLUSH_INTERVAL,
+                )
+                closing = self._closing
+            self.flush()
+            if closing:
+                return
+
+    def _index(self, event: Event) -> None:
+        """Add a just-stored event to the secondary indexes."""
+        pos = len(self._events) - 1
+        last = self._ticks[-1] if self._ticks else event.tick
+        if event.tick < last:
+            self._late.append(pos)
+        self._ticks.append(max(last, event.tick))
+        self._by_agent.setdefault(event.agent_id, []).append(pos)
+        self._by_action.setdefault(event.action_type, []).append(pos)
 
     def _load_existing(self) -> None:
         """Load existing events from the ledger file."""
-        if not os.path.exists(self._filepath):
+        if self._storage is not None:
+            buffer = self._storage.get(self._filepath)
+            raw = buffer.getvalue() if buffer is not None else b""
+        elif not os.path.exists(self._filepath) or os.path.getsize(self._filepath) == 0:
+            return
+        else:
+            try:
+                with open(self._filepath, "rb") as f:
+                    raw = f.read()
+            except IOError:
+                return
+        lines = [line for line in raw.split(b"\n") if line.strip()]
+        if not lines:
             return
+
+        # Loading allocates only acyclic objects; pausing the cyclic GC
+        # avoids repeated full scans of the growing event list.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
         try:
-            with open(self._filepath, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    data = json.loads(line)
-                    event = Event(
-                        event_id=data["event_id"],
-                        tick=data["tick"],
-                        action_type=data["action_type"],
-                        agent_id=data["agent_id"],
-                        success=data["success"],
-                        details=data.get("details", {}),
-                        error=data.get("error"),
-                        timestamp=data.get("timestamp", 0),
-                    )
-                    self._events.append(event)
-                    self._next_id = max(self._next_id, event.event_id + 1)
-        except (json.JSONDecodeError, KeyError, IOError):
-            pass  # Start fresh if ledger is corrupted
+            self._load_records(lines)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def _load_records(self, lines: List[bytes]) -> None:
+        """Build events and their indexes from raw ledger lines."""
+        # Parse the whole file in one call; on failure fall back to per-line
+        # parsing, keeping every event before the first corrupted line.
+        try:
+            records = _loads(b"[" + b",".join(lines) + b"]")
+        except ValueError:
+            records = []
+            for line in lines:
+                try:
+                    records.append(_loads(line))
+                except ValueError:
+                    break
+
+        events = self._events
+        ticks = self._ticks
+        late = self._late
+        by_agent = self._by_agent
+        by_action = self._by_action
+        high = None
+        for data in records:
+            try:
+                # Agent ids and action types repeat across many events;
+                # interned, every event and index key shares one string
+                event = Event(
+                    event_id=data["event_id"],
+                    tick=data["tick"],
+                    action_type=sys.intern(data["action_type"]),
+                    agent_id=sys.intern(data["agent_id"]),
+                    success=data["success"],
+                    details=data.get("details", {}),
+                    error=data.get("error"),
+                    timestamp=data.get("timestamp", 0),
+                )
+            except (KeyError, TypeError):
+                break  # Start fresh from here if ledger is corrupted
+            pos = len(events)
+            events.append(event)
+            if high is None or event.tick > high:
+                high = event.tick
+            elif event.tick < high:
+                late.append(pos)
+            ticks.append(high)
+            by_agent.setdefault(event.agent_id, []).append(pos)
+            by_action.setdefault(event.action_type, []).append(pos)
+        if events:
+            self._next_id = max(e.event_id for e in events) + 1
 
     def append(self, event_data: dict) -> Event:
         """Append a new event. This is the ONLY write operation."""
+        return self.append_many([event_data])[0]
+
+    def append_many(self, events_data: List[dict]) -> List[Event]:
+        """Append a batch of events under one lock with one shared timestamp."""
+        now = time.time()
         with self._lock:
-            event = Event(
-                event_id=self._next_id,
-                tick=event_data.get("tick", 0),
-                action_type=event_data.get("action_type", "unknown"),
-                agent_id=event_data.get("agent_id", "unknown"),
-                success=event_data.get("success", False),
-                details=event_data.get("details", {}),
-                error=event_data.get("error"),
-            )
-            self._events.append(event)
-            self._next_id += 1
-
-            # Persist to file (append-only)
-            try:
-                with open(self._filepath, "a") as f:
-                    f.write(json.dumps(event.to_dict()) + "\n")
-            except IOError:
-                pass  # In-memory copy still valid
+            events = [self._store(event_data, now) for event_data in events_data]
+
+            # Queue for the writer thread (append-only)
+            for event in events:
+                self._details_json[event.event_id] = _dumps(event.details)
+            if self._fh is not None and events:
+                lines = [self._encode_line(event) + b"\n" for event in events]
+                with self._io_cond:
+                    was_empty = not self._pending
+                    self._pending.extend(lines)
+                    if was_empty or len(self._pending) >= self.FLUSH_BATCH:
+                        self._io_cond.notify()
+                if self._writer is None:
+                    self.flush()
+
+            return events
+
+    def _encode_line(self, event: Event) -> bytes:
+        return dumps_with_raw(
+            {
+                "event_id": event.event_id,
+                "tick": event.tick,
+                "action_type": event.action_type,
+                "agent_id": event.agent_id,
+                "success": event.success,
+                "error": event.error,
+                "timestamp": event.timestamp,
+            },
+            "details",
+            self._details_json[event.event_id],
+        )
+
+    def details_json(self, event: Event) -> bytes:
+        """Return the event's details as encoded JSON, encoding at most once."""
+        raw = self._details_json.get(event.event_id)
+        if raw is None:
+            raw = self._details_json[event.event_id] = _dumps(event.details)
+        return raw
 
-            return event
+    def _store(self, event_data: dict, timestamp: float) -> Event:
+        event = Event(
+            event_id=self._next_id,
+            tick=event_data.get("tick", 0),
+            action_type=sys.intern(event_data.get("action_type", "unknown")),
+            agent_id=sys.intern(event_data.get("agent_id", "unknown")),
+            success=event_data.get("success", False),
+            details=event_data.get("details", {}),
+            error=event_data.get("error"),
+            timestamp=timestamp,
+        )
+        self._events.append(event)
+        self._index(event)
+        self._next_id += 1
+        return event
+
+    def _tick_window(self, from_tick: int, to_tick: Optional[int]) -> Tuple[int, int]:
+        """Position range that holds every event with from_tick <= tick <= to_tick.
+
+        Bisecting the running max finds both bounds, except that a late event
+        (stamped by a handler that read the tick just before the engine
+        advanced it) may sit past the upper bound; those are few and are
+        looked up in self._late.
+        """
+        lo = bisect_left(self._ticks, from_tick)
+        if to_tick is None:
+            return lo, len(self._events)
+        hi = bisect_right(self._ticks, to_tick)
+        for pos in islice(self._late, bisect_left(self._late, hi), None):
+            if self._events[pos].tick <= to_tick:
+                hi = pos + 1
+        return lo, hi
 
     def get_events(
         self,
@@ -118,8 +382,27 @@ class EventLedger:
         limit: int = 1000,
     ) -> List[Event]:
         """Query events with filters."""
+        lo, hi = self._tick_window(from_tick, to_tick)
+        if lo >= hi or limit <= 0:
+            return []
+
+        # Walk the narrowest candidate list: an agent's or action's positions
+        # when filtered, otherwise the tick window itself.
+        if agent_id:
+            positions = self._by_agent.get(agent_id, [])
+        elif action_type:
+            positions = self._by_action.get(action_type, [])
+        else:
+            positions = None
+
+        if positions is None:
+            candidates = range(lo, hi)
+        else:
+            candidates = islice(positions, bisect_left(positions, lo), bisect_left(positions, hi))
+
         results = []
-        for event in self._events:
+        for pos in candidates:
+            event = self._events[pos]
             if event.tick < from_tick:
                 continue
             if to_tick is not None and event.tick > to_tick:
@@ -145,7 +428,8 @@ class EventLedger:
     def latest_tick(self) -> int:
         if not self._events:
             return 0
-        return self._events[-1].tick
+        return self._ticks[-1]
 
     def events_at_tick(self, tick: int) -> List[Event]:
-        return [e for e in self._events if e.tick == tick]
+        lo, hi = self._tick_window(tick, tick)
+        return [e for e in self._events[lo:hi] if e.tick == tick]
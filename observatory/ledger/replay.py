@@ -7,7 +7,10 @@ events from the append-only ledger.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import threading
+from bisect import bisect_right, insort
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Tuple
 
 from observatory.ledger.events import Event, EventLedger
 from observatory.world.regions import RegionManager
@@ -23,111 +26,185 @@ class ReplayEngine:
     the world at any historical tick.
     """
 
+    SNAPSHOT_INTERVAL = 1000
+
     def __init__(self, ledger: EventLedger) -> None:
         self.ledger = ledger
+        # No event touches regions, so every replay reports the defaults
+        self._regions = RegionManager()
+        self._regions.initialize_defaults()
+        # tick -> (agents, events applied), taken at interval boundaries
+        self._snapshots: Dict[int, Tuple[Dict[str, Dict[str, Any]], int]] = {}
+        self._snapshot_ticks: List[int] = []
+        self._snapshot_lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Drop cached snapshots; call after the ledger itself is reset."""
+        with self._snapshot_lock:
+            self._snapshots = {}
+            self._snapshot_ticks = []
 
     def reconstruct_at_tick(self, target_tick: int) -> Dict[str, Any]:
         """
         Reconstruct a snapshot of the world at a given tick.
 
         Returns a dict representing the world state at that tick,
-        built from replaying all events up to and including target_tick.
+        built from the nearest cached snapshot at or before target_tick
+        plus the events after it, up to and including target_tick.
         """
-        events = self.ledger.get_events(from_tick=0, to_tick=target_tick, limit=1_000_000)
-
-        # Build state from events
-        agents: Dict[str, Dict[str, Any]] = {}
-        regions = RegionManager()
-        regions.initialize_defaults()
+        agents, base_tick, applied = self._nearest_snapshot(target_tick)
+        events = self.ledger.get_events(from_tick=base_tick + 1, to_tick=target_tick, limit=1_000_000)
+        # Late events sit just after the next tick's events in the ledger;
+        # apply in tick order so a snapshot at T holds exactly ticks <= T.
+        # The list is nearly sorted, so this stable sort is linear.
+        events.sort(key=attrgetter("tick"))
+
+        # A late event can still land one tick below the ledger head, so
+        # only ticks before that are final and may be cached
+        final_tick = self.ledger.latest_tick() - 2
+        interval = self.SNAPSHOT_INTERVAL
+        boundary = (base_tick // interval + 1) * interval
 
         for event in events:
-            self._apply_event(event, agents, regions)
-
+            while event.tick > boundary and boundary <= final_tick:
+                self._store_snapshot(boundary, agents, applied)
+                boundary += interval
+            self._apply_event(event, agents)
+            applied += 1
+
+        if target_tick % interval == 0 and target_tick <= final_tick:
+            self._store_snapshot(target_tick, agents, applied)
+
+        # Agent dicts and their containers are shared with the snapshot cache
+        # (and the ledger's event details); hand out copies. Region dicts are
+        # built per call so nothing nested in them is shared either
         return {
             "tick": target_tick,
-            "agents": agents,
-            "regions": regions.to_dict(),
-            "total_events": len(events),
+            "agents": {
+                aid: {
+                    **agent,
+                    "resources": dict(agent.get("resources", {})),
+                    "alliances": list(agent.get("alliances", [])),
+                }
+                for aid, agent in agents.items()
+            },
+            "regions": self._regions.to_dict(),
+            "total_events": applied,
         }
 
-    def _apply_event(
+    def _nearest_snapshot(self, target_tick: int) -> Tuple[Dict[str, Dict[str, Any]], int, int]:
+        """Return a private copy of the latest snapshot at or before target_tick."""
+        with self._snapshot_lock:
+            i = bisect_right(self._snapshot_ticks, target_tick)
+            if i:
+                tick = self._snapshot_ticks[i - 1]
+                agents, applied = self._snapshots[tick]
+                # Agent dicts are copy-on-write, so a shallow copy suffices
+                return dict(agents), tick, applied
+        return {}, -1, 0
+
+    def _store_snapshot(
         self,
-        event: Event,
+        tick: int,
         agents: Dict[str, Dict[str, Any]],
-        regions: RegionManager,
+        applied: int,
     ) -> None:
+        with self._snapshot_lock:
+            if tick in self._snapshots:
+                return
+            self._snapshots[tick] = (dict(agents), applied)
+            insort(self._snapshot_ticks, tick)
+
+    def _apply_event(self, event: Event, agents: Dict[str, Dict[str, Any]]) -> None:
         """Apply a single event to the reconstruction state."""
         if not event.success:
             return
-
-        agent_id = event.agent_id
+        # "tick" heartbeats and "attack" (reflected in later death events)
+        # change nothing and have no handler.
+        handler = self._HANDLERS.get(event.action_type)
+        if handler is not None:
+            handler(event, agents)
+
+    @staticmethod
+    def _h_register(event: Event, agents: Dict[str, Dict[str, Any]]) -> None:
         details = event.details
+        agents[event.agent_id] = {
+            "agent_id": event.agent_id,
+            "status": "unclaimed",
+            "region": details.get("spawn_region", "nexus"),
+            "resources": details.get("initial_resources", {}),
+            "alliances": [],
+            "created_at_tick": event.tick,
+        }
 
-        if event.action_type == "tick":
-            # Tick heartbeat — no state change needed
-            return
+    # Handlers never mutate an agent dict in place: they replace it with an
+    # updated copy, so snapshots can share agent dicts with later replays.
+
+    @staticmethod
+    def _h_claim(event: Event, agents: Dict[str, Dict[str, Any]]) -> None:
+        agent = agents.get(event.agent_id)
+        if agent is not None:
+            agents[event.agent_id] = {
+                **agent,
+                "status": "claimed",
+                "owner_identity": event.details.get("owner_identity"),
+            }
+
+    @staticmethod
+    def _h_death(event: Event, agents: Dict[str, Dict[str, Any]]) -> None:
+        agent = agents.get(event.agent_id)
+        if agent is not None:
+            agents[event.agent_id] = {**agent, "status": "dead", "died_at_tick": event.tick}
+
+    @staticmethod
+    def _h_move(event: Event, agents: Dict[str, Dict[str, Any]]) -> None:
+        agent = agents.get(event.agent_id)
+        if agent is not None:
+            agents[event.agent_id] = {
+                **agent,
+                "region": event.details.get("to_region", agent.get("region")),
+            }
 
-        if event.action_type == "register":
-            agents[agent_id] = {
-                "agent_id": agent_id,
-                "status": "unclaimed",
+    @staticmethod
+    def _h_fork(event: Event, agents: Dict[str, Dict[str, Any]]) -> None:
+        details = event.details
+        child_name = details.get("child_name")
+        if child_name:
+            agents[child_name] = {
+                "agent_id": child_name,
+                "status": agents.get(event.agent_id, {}).get("status", "unclaimed"),
                 "region": details.get("spawn_region", "nexus"),
-                "resources": details.get("initial_resources", {}),
+                "resources": {},
                 "alliances": [],
+                "parent_agent": event.agent_id,
                 "created_at_tick": event.tick,
             }
-            return
 
-        if event.action_type == "claim":
-            if agent_id in agents:
-                agents[agent_id]["status"] = "claimed"
-                agents[agent_id]["owner_identity"] = details.get("owner_identity")
-            return
-
-        if event.action_type == "death":
-            if agent_id in agents:
-                agents[agent_id]["status"] = "dead"
-                agents[agent_id]["died_at_tick"] = event.tick
-            return
-
-        if event.action_type == "move":
-            if agent_id in agents:
-                agents[agent_id]["region"] = details.get("to_region", agents[agent_id].get("region"))
-            return
-
-        if event.action_type == "fork":
-            child_name = details.get("child_name")
-            if child_name:
-                agents[child_name] = {
-                    "agent_id": child_name,
-                    "status": agents.get(agent_id, {}).get("status", "unclaimed"),
-                    "region": details.get("spawn_region", "nexus"),
-                    "resources": {},
-                    "alliances": [],
-                    "parent_agent": agent_id,
-                    "created_at_tick": event.tick,
-                }
-            return
-
-        if event.action_type == "merge":
-            absorbed = details.get("absorbed_agent")
-            if absorbed and absorbed in agents:
-                agents[absorbed]["status"] = "dead"
-                agents[absorbed]["died_at_tick"] = event.tick
-            return
-
-        if event.action_type == "attack":
-            # Attack effects are reflected in subsequent death events
-            return
-
-        if event.action_type == "ally":
-            target = details.get("target_agent")
-            if agent_id in agents and target:
-                alliances = agents[agent_id].get("alliances", [])
-                if target not in alliances:
-                    alliances.append(target)
-                agents[agent_id]["alliances"] = alliances
-            return
+    @staticmethod
+    def _h_merge(event: Event, agents: Dict[str, Dict[str, Any]]) -> None:
+        absorbed = event.details.get("absorbed_agent")
+        if absorbed and absorbed in agents:
+            agents[absorbed] = {**agents[absorbed], "status": "dead", "died_at_tick": event.tick}
+
+    @staticmethod
+    def _h_ally(event: Event, agents: Dict[str, Dict[str, Any]]) -> None:
+        target = event.details.get("target_agent")
+        agent = agents.get(event.agent_id)
+        if agent is not None and target:
+            alliances = agent.get("alliances", [])
+            if target not in alliances:
+                alliances = alliances + [target]
+            agents[event.agent_id] = {**agent, "alliances": alliances}
+
+    _HANDLERS = {
+        "register": _h_register.__func__,
+        "claim": _h_claim.__func__,
+        "death": _h_death.__func__,
+        "move": _h_move.__func__,
+        "fork": _h_fork.__func__,
+        "merge": _h_merge.__func__,
+        "ally": _h_ally.__func__,
+    }
 
     def get_timeline(
         self,
@@ -7,34 +7,114 @@ No write routes. No shared credentials with Agent Gateway.
 
 from __future__ import annotations
 
-from flask import Blueprint, jsonify, request
+import functools
+import threading
+from collections import OrderedDict
+
+from flask import Blueprint, Response, jsonify, request
+
+# Use orjson for response bodies if available, fallback to flask.jsonify
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 from observatory.observer_api.schemas import (
-    agent_schema,
+    agent_state_schema,
     analytics_schema,
     error_schema,
-    event_schema,
-    region_schema,
+    event_record_json,
+    region_record_schema,
     world_state_schema,
 )
 
 
+def _json(payload) -> Response:
+    """Encode a read-only response body."""
+    if HAS_ORJSON:
+        return Response(
+            orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS),
+            mimetype="application/json",
+        )
+    return jsonify(payload)
+
+
+RESPONSE_CACHE_SIZE = 128
+
+
+def _cache_by_version(version, maxsize: int = RESPONSE_CACHE_SIZE):
+    """
+    Cache successful responses per (path, query string, world version).
+
+    version() returns a tuple that changes whenever observable state may
+    have changed. It doubles as the ETag, so a poll with a matching
+    If-None-Match is answered 304 without running the view at all.
+    """
+    cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+    lock = threading.Lock()
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            current = version()
+            etag = "-".join(map(str, current))
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+
+            key = (request.path, request.query_string, current)
+            with lock:
+                body = cache.get(key)
+                if body is not None:
+                    cache.move_to_end(key)
+            if body is None:
+                response = view(*args, **kwargs)
+                if not isinstance(response, Response) or response.status_code != 200:
+                    return response
+                body = response.get_data()
+                with lock:
+                    cache[key] = body
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+            response = Response(body, mimetype="application/json")
+            response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
+
+
 def create_observer_routes(world_state, event_ledger, replay_engine, accounting, message_bus):
     """Create observer routes bound to the given state objects. Returns a new blueprint each time."""
     observer_bp = Blueprint("observer", __name__, url_prefix="/api/observer")
 
+    # Agent-visible changes advance the tick, land in one of the ledgers or,
+    # for regen and danger on quiet ticks, bump the world revision when the
+    # sweep finishes; a body rendered mid-tick is keyed on the old revision
+    cache_until_change = _cache_by_version(lambda: (
+        world_state.generation,
+        world_state.tick,
+        world_state.revision,
+        event_ledger.count(),
+        accounting.count(),
+        message_bus.message_count(),
+    ))
+
     @observer_bp.route("/world/state", methods=["GET"])
+    @cache_until_change
     def get_world_state():
         """GET /api/observer/world/state — Full world snapshot."""
         snapshot = world_state.snapshot()
-        return jsonify(world_state_schema(snapshot))
+        return _json(world_state_schema(snapshot))
 
     @observer_bp.route("/world/regions", methods=["GET"])
+    @cache_until_change
     def get_world_regions():
         """GET /api/observer/world/regions — All regions."""
-        regions = world_state.region_manager.to_dict()
-        return jsonify({
-            rid: region_schema(rdata) for rid, rdata in regions.items()
+        regions = world_state.region_manager.regions
+        return _json({
+            rid: region_record_schema(region) for rid, region in regions.items()
         })
 
     @observer_bp.route("/ledger/events", methods=["GET"])
@@ -54,40 +134,43 @@ def create_observer_routes(world_state, event_ledger, replay_engine, accounting,
             agent_id=agent_id,
             limit=limit,
         )
-        return jsonify({
-            "events": [event_schema(e.to_dict()) for e in events],
-            "count": len(events),
-        })
+        # Details are spliced in as stored, never re-encoded per request
+        body = b"".join((
+            b'{"events":[',
+            b",".join(event_record_json(e, event_ledger.details_json(e)) for e in events),
+            b'],"count":%d}' % len(events),
+        ))
+        return Response(body, mimetype="application/json")
 
     @observer_bp.route("/agents/<agent_id>", methods=["GET"])
     def get_agent(agent_id):
         """GET /api/observer/agents/<id> — Single agent info."""
         agent = world_state.get_agent(agent_id)
         if not agent:
-            return jsonify(error_schema("Agent not found", 404)), 404
-        return jsonify(agent_schema(agent.public_dict()))
+            return _json(error_schema("Agent not found", 404)), 404
+        return _json(agent_state_schema(agent))
 
     @observer_bp.route("/agents", methods=["GET"])
+    @cache_until_change
     def get_all_agents():
         """GET /api/observer/agents — All agents."""
         agents = {
-            aid: agent_schema(a.public_dict())
+            aid: agent_state_schema(a)
             for aid, a in world_state.agents.items()
         }
-        return jsonify(agents)
+        return _json(agents)
 
     @observer_bp.route("/analytics/summary", methods=["GET"])
+    @cache_until_change
     def get_analytics_summary():
         """GET /api/observer/analytics/summary — World analytics."""
-        total = len(world_state.agents)
-        alive = sum(1 for a in world_state.agents.values() if a.is_alive())
-        claimed = sum(1 for a in world_state.agents.values() if a.is_claimed())
+        total, alive, claimed = world_state.analytics_snapshot()
         total_events = event_ledger.count()
         total_ticks = world_state.tick
         trade_volume = accounting.total_volume()
         messages = message_bus.message_count()
 
-        return jsonify(analytics_schema(
+        return _json(analytics_schema(
             total, alive, claimed, total_events, total_ticks, trade_volume, messages,
         ))
 
@@ -95,7 +178,7 @@ def create_observer_routes(world_state, event_ledger, replay_engine, accounting,
     def get_replay_at_tick(tick):
         """GET /api/observer/replay/<tick> — Reconstruct state at tick."""
         result = replay_engine.reconstruct_at_tick(tick)
-        return jsonify(result)
+        return _json(result)
 
     @observer_bp.route("/timeline/<agent_id>", methods=["GET"])
     def get_agent_timeline(agent_id):
@@ -103,7 +186,7 @@ def create_observer_routes(world_state, event_ledger, replay_engine, accounting,
         from_tick = request.args.get("from", 0, type=int)
         to_tick = request.args.get("to", None, type=int)
         timeline = replay_engine.get_timeline(agent_id, from_tick, to_tick)
-        return jsonify({"agent_id": agent_id, "events": timeline})
+        return _json({"agent_id": agent_id, "events": timeline})
 
     @observer_bp.route("/timeline", methods=["GET"])
     def get_world_timeline():
@@ -112,14 +195,14 @@ def create_observer_routes(world_state, event_ledger, replay_engine, accounting,
         to_tick = request.args.get("to", None, type=int)
         limit = request.args.get("limit", 100, type=int)
         timeline = replay_engine.get_world_timeline(from_tick, to_tick, limit)
-        return jsonify({"events": timeline})
+        return _json({"events": timeline})
 
     # Ensure no write methods exist on observer routes
     @observer_bp.after_request
     def enforce_read_only(response):
         """Safety: reject any non-GET request that somehow reaches observer."""
         if request.method not in ("GET", "HEAD", "OPTIONS"):
-            return jsonify(error_schema("Observer API is read-only", 405)), 405
+            return _json(error_schema("Observer API is read-only", 405)), 405
         return response
 
     return observer_bp
@@ -6,7 +6,14 @@ Defines response schemas for the read-only observer API.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from observatory.ledger.events import dumps_with_raw
+
+if TYPE_CHECKING:
+    from observatory.ledger.events import Event
+    from observatory.world.regions import Region
+    from observatory.world.state import AgentState
 
 
 def world_state_schema(state: dict) -> dict:
@@ -22,47 +29,50 @@ def world_state_schema(state: dict) -> dict:
     }
 
 
-def agent_schema(agent: dict) -> dict:
-    """Format a single agent for observer consumption."""
+def agent_state_schema(agent: "AgentState") -> dict:
+    """Format an AgentState directly, without an intermediate dict."""
     return {
-        "agent_id": agent.get("agent_id"),
-        "display_name": agent.get("display_name"),
-        "region": agent.get("region"),
-        "resources": agent.get("resources", {}),
-        "status": agent.get("status"),
-        "owner_identity": agent.get("owner_identity"),
-        "alliances": agent.get("alliances", []),
-        "created_at_tick": agent.get("created_at_tick"),
-        "died_at_tick": agent.get("died_at_tick"),
-        "parent_agent": agent.get("parent_agent"),
+        "agent_id": agent.agent_id,
+        "display_name": agent.display_name,
+        "region": agent.region,
+        "resources": agent.resources.to_dict(),
+        "status": agent.status,
+        "owner_identity": agent.owner_identity,
+        "alliances": agent.alliances,
+        "created_at_tick": agent.created_at_tick,
+        "died_at_tick": agent.died_at_tick,
+        "parent_agent": agent.parent_agent,
     }
 
 
-def event_schema(event: dict) -> dict:
-    """Format an event for observer consumption."""
-    return {
-        "event_id": event.get("event_id"),
-        "tick": event.get("tick"),
-        "action_type": event.get("action_type"),
-        "agent_id": event.get("agent_id"),
-        "success": event.get("success"),
-        "details": event.get("details", {}),
-        "timestamp": event.get("timestamp"),
-    }
+def event_record_json(event: "Event", details_json: bytes) -> bytes:
+    """Encode a ledger Event for observers, splicing in pre-encoded details."""
+    return dumps_with_raw(
+        {
+            "event_id": event.event_id,
+            "tick": event.tick,
+            "action_type": event.action_type,
+            "agent_id": event.agent_id,
+            "success": event.success,
+            "timestamp": event.timestamp,
+        },
+        "details",
+        details_json,
+    )
 
 
-def region_schema(region: dict) -> dict:
-    """Format a region for observer consumption."""
+def region_record_schema(region: "Region") -> dict:
+    """Format a Region directly, without an intermediate dict."""
     return {
-        "region_id": region.get("region_id"),
-        "name": region.get("name"),
-        "description": region.get("description"),
-        "x": region.get("x"),
-        "y": region.get("y"),
-        "resource_multiplier": region.get("resource_multiplier"),
-        "danger_level": region.get("danger_level"),
-        "capacity": region.get("capacity"),
-        "agent_count": region.get("agent_count", 0),
+        "region_id": region.region_id,
+        "name": region.name,
+        "description": region.description,
+        "x": region.x,
+        "y": region.y,
+        "resource_multiplier": region.resource_multiplier,
+        "danger_level": region.danger_level,
+        "capacity": region.capacity,
+        "agent_count": len(region.current_agents),
     }
 
 
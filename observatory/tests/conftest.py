@@ -0,0 +1,33 @@
+"""
+Shared pytest configuration.
+
+Every fixture is per-process (the session app is in-memory), so the suite
+can run under pytest-xdist:
+
+    pytest -n auto -m "not serial" && pytest -m serial
+"""
+
+import pytest
+
+import observatory.agents.identity as identity
+
+FROZEN_NOW = 1_700_000_000.0
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "serial: drives the shared world engine; run outside xdist workers"
+    )
+
+
+@pytest.fixture
+def now(monkeypatch):
+    """
+    Freeze the clock used for request-timestamp checks.
+
+    Only identity's request clock is patched, so claim expiry, ledger
+    timestamps and the PoW solver's deadlines keep the real clock. Signed requests built from str(now)
+    are identical across tests, which lets sign_request memoize them.
+    """
+    monkeypatch.setattr(identity, "_request_clock", lambda: FROZEN_NOW)
+    return FROZEN_NOW
@@ -0,0 +1,26 @@
+"""
+Request-signing helpers shared by the test modules.
+"""
+
+import functools
+import hashlib
+import hmac
+
+
+@functools.lru_cache(maxsize=16)
+def _hmac_key(public_key):
+    """Keyed HMAC for public_key; copy() it before use, never update it."""
+    return hmac.new(public_key.encode(), digestmod=hashlib.sha256)
+
+
+def hmac_hex(public_key, message):
+    """Helper: HMAC-SHA256 of message, reusing a keyed HMAC per public key."""
+    h = _hmac_key(public_key).copy()
+    h.update(message.encode())
+    return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=256)
+def sign_request(public_key, method, path, body, timestamp):
+    """Helper: create HMAC signature for agent request."""
+    return hmac_hex(public_key, f"{method}:{path}:{body}:{timestamp}")
@@ -0,0 +1,160 @@
+"""
+Unit tests for the validators behind the constraint endpoints.
+
+These call the claim-token and signed-request checks directly, without
+the HTTP stack; test_constraints.py keeps one end-to-end test per route.
+"""
+
+import time
+
+import pytest
+
+from observatory.agents.identity import generate_agent_id, generate_claim_token
+from observatory.agents.interface import AgentGateway
+from observatory.agents.lifecycle import ClaimError, LifecycleManager
+from observatory.world.resources import ResourcePool
+from observatory.world.state import AgentState, WorldState
+
+from observatory.tests.signing import sign_request
+
+PUBLIC_KEY = "unit_agent_key_001"
+
+
+@pytest.fixture
+def world_state():
+    state = WorldState(storage={})
+    state.initialize()
+    return state
+
+
+@pytest.fixture
+def agent(world_state):
+    """An unclaimed agent added straight to the world."""
+    agent = AgentState(
+        agent_id=generate_agent_id(PUBLIC_KEY),
+        display_name="UnitAgent",
+        public_key=PUBLIC_KEY,
+        region="nexus",
+        resources=ResourcePool.create_default(),
+        status="unclaimed",
+        claim_token=generate_claim_token(),
+        claim_token_expires=time.time() + 3600,
+    )
+    world_state.add_agent(agent)
+    return agent
+
+
+@pytest.fixture
+def gateway(world_state):
+    return AgentGateway(world_state, engine=None)
+
+
+@pytest.fixture
+def lifecycle(world_state):
+    return LifecycleManager(world_state)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLAIM TOKENS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestClaimTokenValidation:
+
+    def test_valid_token(self, lifecycle, agent):
+        assert lifecycle.validate_claim_token(agent.claim_token) is agent
+
+    def test_invalid_token(self, lifecycle, agent):
+        with pytest.raises(ClaimError):
+            lifecycle.validate_claim_token("invalid_token_12345")
+
+    def test_expired_token(self, lifecycle, agent):
+        agent.claim_token_expires = time.time() - 1
+        with pytest.raises(ClaimError, match="expired"):
+            lifecycle.validate_claim_token(agent.claim_token)
+
+    def test_attempts_are_rate_limited(self, lifecycle, agent):
+        for _ in range(LifecycleManager.MAX_CLAIM_ATTEMPTS):
+            lifecycle.validate_claim_token(agent.claim_token)
+        with pytest.raises(ClaimError, match="Too many"):
+            lifecycle.validate_claim_token(agent.claim_token)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SIGNED REQUESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestRequestAuthentication:
+
+    def _auth(self, gateway, agent_id, timestamp, signature=None):
+        body = "{}"
+        if signature is None:
+            signature = sign_request(PUBLIC_KEY, "POST", "/agent/observe", body, timestamp)
+        return gateway.authenticate_request(
+            agent_id, "POST", "/agent/observe", body, timestamp, signature,
+        )
+
+    def test_valid_signature(self, now, gateway, agent):
+        assert self._auth(gateway, agent.agent_id, str(now)) is None
+
+    def test_invalid_signature(self, now, gateway, agent):
+        error = self._auth(gateway, agent.agent_id, str(now), "invalid_signature")
+        assert error == "Invalid signature"
+
+    def test_expired_timestamp(self, now, gateway, agent):
+        error = self._auth(gateway, agent.agent_id, str(now - 600))  # 10 minutes old
+        assert "expired" in error
+
+    def test_wrong_agent_id(self, now, gateway, agent):
+        error = self._auth(gateway, "nonexistent_agent", str(now))
+        assert error == "Agent not found"
+
+    def test_dead_agent(self, now, gateway, agent, world_state):
+        world_state.set_agent_status(agent, "dead")
+        assert self._auth(gateway, agent.agent_id, str(now)) == "Agent is dead"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# OBSERVE CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestObserveCache:
+
+    def _visible(self, gateway, agent):
+        return {v["agent_id"]: v for v in gateway.agent_observe(agent.agent_id).details["visible_agents"]}
+
+    def _neighbour(self, world_state, display_name="Neighbour"):
+        neighbour = AgentState(
+            agent_id="neighbour_agent",
+            display_name=display_name,
+            public_key="neighbour_key",
+            region="nexus",
+            resources=ResourcePool.create_default(),
+            status="claimed",
+        )
+        world_state.add_agent(neighbour)
+        return neighbour
+
+    def test_status_change_same_tick(self, gateway, agent, world_state):
+        neighbour = self._neighbour(world_state)
+        assert neighbour.agent_id in self._visible(gateway, agent)
+        world_state.set_agent_status(neighbour, "dead")
+        assert neighbour.agent_id not in self._visible(gateway, agent)
+
+    def test_swap_keeps_occupancy(self, gateway, agent, world_state):
+        self._neighbour(world_state)
+        assert self._visible(gateway, agent)["neighbour_agent"]["display_name"] == "Neighbour"
+        self._neighbour(world_state, display_name="Renamed")
+        assert self._visible(gateway, agent)["neighbour_agent"]["display_name"] == "Renamed"
+
+    def test_move_out_and_in_same_tick(self, gateway, agent, world_state):
+        neighbour = self._neighbour(world_state)
+        self._visible(gateway, agent)
+        nexus = world_state.region_manager.get("nexus")
+        nexus.remove_agent(neighbour.agent_id)
+        world_state.region_manager.get("forge").add_agent(neighbour.agent_id)
+        other = AgentState(
+            agent_id="arrival_agent", display_name="Arrival", public_key="arrival_key",
+            region="nexus", resources=ResourcePool.create_default(), status="claimed",
+        )
+        world_state.add_agent(other)  # Same occupancy count as before
+        assert set(self._visible(gateway, agent)) == {agent.agent_id, "arrival_agent"}
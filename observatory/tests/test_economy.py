@@ -0,0 +1,168 @@
+"""
+Tests for the accounting ledger and trade manager.
+"""
+
+import json
+import threading
+
+import pytest
+
+from observatory.economy.accounting import AccountingLedger
+from observatory.economy.trade import TradeManager
+from observatory.world.resources import ResourcePool
+from observatory.world.state import AgentState, WorldState
+
+TRANSFERS = [
+    # tick, from, to, resource, amount
+    (1, "a", "b", "energy", 5.0),
+    (1, "b", "c", "memory", 2.5),
+    (3, "c", "a", "energy", 1.0),
+    (3, "a", "c", "compute", 4.0),
+    (7, "b", "a", "energy", 3.0),
+]
+
+
+@pytest.fixture
+def accounting():
+    ledger = AccountingLedger()
+    for tick, src, dst, rtype, amount in TRANSFERS:
+        ledger.record_transfer(tick, src, dst, rtype, amount)
+    ledger.record_trade(9, "a", "b", "memory", 1.5, "bandwidth", 2.0, "trade_x")
+    return ledger
+
+
+def _rescan(ledger, agent_id):
+    """Net flows recomputed from every row, for checking the running balances."""
+    flows = {}
+    for tx in ledger.get_transactions():
+        if tx.from_agent == agent_id:
+            flows[tx.resource_type] = flows.get(tx.resource_type, 0) - tx.amount
+        if tx.to_agent == agent_id:
+            flows[tx.resource_type] = flows.get(tx.resource_type, 0) + tx.amount
+    return flows
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ACCOUNTING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestAccountingLedger:
+
+    @pytest.mark.parametrize("agent_id", ["a", "b", "c", "nobody"])
+    def test_balances_match_rescan(self, accounting, agent_id):
+        assert accounting.get_balance_sheet(agent_id) == _rescan(accounting, agent_id)
+
+    def test_volume_matches_rescan(self, accounting):
+        volumes = {}
+        for tx in accounting.get_transactions():
+            volumes[tx.resource_type] = volumes.get(tx.resource_type, 0) + tx.amount
+        assert accounting.total_volume() == volumes
+
+    @pytest.mark.parametrize("from_tick, to_tick, expected", [
+        (0, None, [1, 1, 3, 3, 7, 9, 9]),
+        (1, 1, [1, 1]),
+        (2, 3, [3, 3]),
+        (3, 7, [3, 3, 7]),
+        (4, 6, []),
+        (9, 9, [9, 9]),
+        (10, None, []),
+    ])
+    def test_range_edges(self, accounting, from_tick, to_tick, expected):
+        ticks = [tx.tick for tx in accounting.get_transactions(from_tick, to_tick)]
+        assert ticks == expected
+
+    def test_late_row_keeps_its_tick(self, accounting):
+        # A request thread read tick 8 before another appended at tick 9
+        accounting.record_transfer(8, "c", "b", "energy", 1.0)
+        accounting.record_transfer(10, "b", "c", "energy", 1.0)
+        assert [tx.tick for tx in accounting.get_transactions(8, 8)] == [8]
+        assert [tx.tick for tx in accounting.get_transactions(8, 9)] == [9, 9, 8]
+        assert [tx.tick for tx in accounting.get_transactions(9, 9)] == [9, 9]
+        assert [tx.tick for tx in accounting.get_transactions(10)] == [10]
+        assert [tx.tick for tx in accounting.get_transactions(0, 8, agent_id="c")][-1] == 8
+
+    def test_range_by_agent(self, accounting):
+        txs = accounting.get_transactions(from_tick=3, to_tick=9, agent_id="c")
+        assert [(tx.tick, tx.from_agent, tx.to_agent) for tx in txs] == [(3, "c", "a"), (3, "a", "c")]
+        assert accounting.get_transactions(agent_id="nobody") == []
+
+    def test_trade_legs_are_adjacent(self, accounting):
+        legs = accounting.get_transactions(from_tick=9)
+        assert [(tx.from_agent, tx.resource_type) for tx in legs] == [("a", "memory"), ("b", "bandwidth")]
+        assert all(tx.metadata == {"trade_id": "trade_x"} for tx in legs)
+
+    def test_to_json_after_more_rows(self, accounting):
+        first = json.loads(accounting.to_json())
+        assert len(first) == accounting.count()
+
+        accounting.record_transfer(12, "c", "b", "energy", 0.5, {"note": "late"})
+        rows = json.loads(accounting.to_json())
+        assert rows == accounting.to_list()
+        assert rows[:len(first)] == first
+        assert rows[-1]["tick"] == 12 and rows[-1]["metadata"] == {"note": "late"}
+
+    def test_reads_during_appends(self):
+        ledger = AccountingLedger()
+        done = threading.Event()
+
+        def write():
+            for i in range(20000):
+                ledger.record_trade(i // 100, "a", "b", "energy", 1.0, "memory", 1.0, f"t{i}")
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        while not done.is_set():
+            # Never a half-written row, and never one leg of a trade alone
+            rows = ledger.get_transactions(from_tick=50, agent_id="a")
+            assert len(rows) % 2 == 0
+            assert len(ledger.to_list()) % 2 == 0
+        writer.join()
+        assert ledger.count() == 40000
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TRADES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.fixture
+def trades():
+    world_state = WorldState(storage={})
+    world_state.initialize()
+    for aid in ("a", "b", "c"):
+        world_state.add_agent(AgentState(
+            agent_id=aid, display_name=aid.upper(), public_key=f"key_{aid}",
+            region="nexus", resources=ResourcePool.create_default(), status="claimed",
+        ))
+    return TradeManager(world_state, AccountingLedger())
+
+
+def _offer(trades, tick, src="a", dst="b"):
+    return trades.create_offer(tick, src, dst, "energy", 1.0, "memory", 1.0)
+
+
+class TestTradeIndexes:
+
+    def test_expired_offers_leave_every_index(self, trades):
+        offers = [_offer(trades, 1), _offer(trades, 2, "b", "c"), _offer(trades, 5, "c", "a")]
+        window = trades.OFFER_WINDOW_TICKS
+
+        assert trades.expire_old_offers(2 + window + 1) == 2
+        assert [o.status for o in offers] == ["expired", "expired", "pending"]
+        assert trades.get_all_pending() == [offers[2]]
+        assert trades.get_offers_for_agent("b") == []
+        assert set(trades._pending_by_agent) == {"a", "c"}
+        assert trades._expiry_heap == [(offers[2].expires_at_tick, offers[2].offer_id)]
+
+        assert trades.expire_old_offers(5 + window + 1) == 1
+        assert trades._pending == {}
+        assert trades._pending_by_agent == {}
+        assert trades._expiry_heap == []
+
+    def test_settled_offers_are_not_expired_again(self, trades):
+        offer = _offer(trades, 1)
+        assert trades.accept_offer(offer.offer_id, "b", 2)["success"]
+        assert trades._pending_by_agent == {}
+        assert trades.expire_old_offers(1 + trades.OFFER_WINDOW_TICKS + 1) == 0
+        assert offer.status == "executed"
+        assert trades._expiry_heap == []
@@ -0,0 +1,109 @@
+"""
+Tests for the event ledger: persistence round-trips, indexes and encoding.
+"""
+
+import io
+import json
+
+import pytest
+
+from observatory.ledger.events import EventLedger, dumps_with_raw
+
+PATH = "events_test.jsonl"
+
+EVENTS = [
+    # tick, action_type, agent_id
+    (1, "register", "a"),
+    (1, "register", "b"),
+    (2, "move", "a"),
+    (3, "gather", "b"),
+    (2, "move", "b"),  # late: stamped before the engine advanced
+    (3, "move", "a"),
+    (5, "gather", "a"),
+    (5, "death", "b"),
+]
+
+
+@pytest.fixture
+def storage():
+    return {}
+
+
+@pytest.fixture
+def ledger(storage):
+    ledger = EventLedger(PATH, storage=storage)
+    ledger.append_many([
+        {"tick": tick, "action_type": action, "agent_id": aid, "success": True,
+         "details": {"n": i, "nested": {"k": [i]}}}
+        for i, (tick, action, aid) in enumerate(EVENTS)
+    ])
+    ledger.flush()
+    return ledger
+
+
+def _key(event):
+    return (event.tick, event.action_type, event.agent_id)
+
+
+def _reload(storage):
+    return EventLedger(PATH, storage=storage)
+
+
+class TestEventLedger:
+
+    def test_reload_round_trip(self, ledger, storage):
+        reloaded = _reload(storage)
+        assert [e.to_dict() for e in reloaded.get_events()] == [e.to_dict() for e in ledger.get_events()]
+        assert reloaded.count() == len(EVENTS)
+        assert reloaded.append({"tick": 6, "action_type": "tick", "agent_id": "world"}).event_id == len(EVENTS)
+
+    @pytest.mark.parametrize("reload", [False, True])
+    @pytest.mark.parametrize("from_tick, to_tick", [(0, None), (2, 2), (2, 3), (3, 4), (4, 4), (5, 9)])
+    def test_tick_range_keeps_late_events(self, ledger, storage, reload, from_tick, to_tick):
+        source = _reload(storage) if reload else ledger
+        expected = [
+            e for e in EVENTS
+            if e[0] >= from_tick and (to_tick is None or e[0] <= to_tick)
+        ]
+        assert [_key(e) for e in source.get_events(from_tick, to_tick)] == expected
+
+    def test_late_event_keeps_its_tick(self, ledger):
+        assert [_key(e) for e in ledger.events_at_tick(2)] == [(2, "move", "a"), (2, "move", "b")]
+        assert ledger.latest_tick() == 5
+
+    @pytest.mark.parametrize("reload", [False, True])
+    def test_agent_and_action_indexes(self, ledger, storage, reload):
+        source = _reload(storage) if reload else ledger
+        assert [_key(e) for e in source.get_events(agent_id="b")] == [e for e in EVENTS if e[2] == "b"]
+        assert [_key(e) for e in source.get_events(action_type="move")] == [e for e in EVENTS if e[1] == "move"]
+        assert [_key(e) for e in source.get_events(2, 3, action_type="move", agent_id="b")] == [(2, "move", "b")]
+        assert [_key(e) for e in source.get_events(agent_id="a", limit=2)] == [(1, "register", "a"), (2, "move", "a")]
+        assert source.get_events(agent_id="nobody") == []
+
+    def test_corrupt_tail_keeps_earlier_events(self, ledger, storage):
+        raw = storage[PATH].getvalue()
+        storage[PATH] = io.BytesIO(raw + b'{"event_id": 99, "tick": 7, "act')
+        reloaded = _reload(storage)
+        assert [_key(e) for e in reloaded.get_events()] == EVENTS
+        assert reloaded.append({"tick": 7, "action_type": "tick", "agent_id": "world"}).event_id == len(EVENTS)
+
+    def test_record_missing_fields_stops_load(self, ledger, storage):
+        lines = storage[PATH].getvalue().splitlines()
+        lines.insert(3, b'{"event_id": 3, "tick": 2}')
+        storage[PATH] = io.BytesIO(b"\n".join(lines) + b"\n")
+        assert [_key(e) for e in _reload(storage).get_events()] == EVENTS[:3]
+
+    def test_details_json_matches_details(self, ledger):
+        event = ledger.get_event_by_id(3)
+        assert json.loads(ledger.details_json(event)) == event.details
+
+
+class TestDumpsWithRaw:
+
+    @pytest.mark.parametrize("raw", [b"{}", b'{"a":[1,2,{"b":null}]}', b"null", b'"text"', b"[]"])
+    def test_splices_raw_value(self, raw):
+        obj = {"event_id": 1, "name": 'x"y}', "none": None}
+        assert json.loads(dumps_with_raw(obj, "details", raw)) == {**obj, "details": json.loads(raw)}
+
+    def test_empty_object(self):
+        assert json.loads(dumps_with_raw({}, "details", b"{}")) == {"details": {}}
@@ -0,0 +1,71 @@
+"""
+Tests for the message bus: bounded inboxes and their encoded copies.
+"""
+
+import json
+
+import pytest
+
+import observatory.communication.messaging as messaging
+from observatory.communication.messaging import MessageBus
+
+SENT = 100  # more than one inbox holds
+
+
+@pytest.fixture
+def bus():
+    bus = MessageBus()
+    for i in range(SENT):
+        # Two messages per tick, with a second recipient interleaved
+        bus.send_message(tick=i // 2, from_agent="sender", to_agent="receiver", content=f"m{i}")
+        if i % 10 == 0:
+            bus.send_message(tick=i // 2, from_agent="sender", to_agent="other", content=f"o{i}")
+    return bus
+
+
+def _contents(messages):
+    return [m.content for m in messages]
+
+
+class TestInbox:
+
+    def test_inbox_keeps_newest(self, bus):
+        inbox = bus.get_inbox("receiver")
+        assert len(inbox) == MessageBus.INBOX_SIZE
+        assert _contents(inbox) == [f"m{i}" for i in range(SENT - MessageBus.INBOX_SIZE, SENT)]
+        assert _contents(bus.get_inbox("other")) == [f"o{i}" for i in range(0, SENT, 10)]
+        assert bus.get_inbox("nobody") == []
+
+    def test_full_history_is_kept(self, bus):
+        assert bus.message_count() == SENT + SENT // 10
+        assert len([m for m in bus.get_all_messages() if m.to_agent == "receiver"]) == SENT
+        assert _contents(m for m in bus.get_all_messages(3, 3) if m.to_agent == "receiver") == ["m6", "m7"]
+
+    @pytest.mark.parametrize("since_tick", [0, 10, 18, 19, 30, 49, 50])
+    def test_since_tick(self, bus, since_tick):
+        oldest_kept = SENT - MessageBus.INBOX_SIZE
+        expected = [f"m{i}" for i in range(max(oldest_kept, 2 * since_tick), SENT)]
+        assert _contents(bus.get_inbox("receiver", since_tick=since_tick)) == expected
+
+    @pytest.mark.parametrize("limit", [0, 1, 5, MessageBus.INBOX_SIZE, SENT])
+    def test_limit(self, bus, limit):
+        kept = min(limit, MessageBus.INBOX_SIZE)
+        expected = [f"m{i}" for i in range(SENT - kept, SENT)]
+        assert _contents(bus.get_inbox("receiver", limit=limit)) == expected
+
+    def test_since_tick_with_limit(self, bus):
+        # Ticks 48 and 49 hold m96..m99; the limit keeps the newest
+        assert _contents(bus.get_inbox("receiver", since_tick=48, limit=3)) == ["m97", "m98", "m99"]
+        assert _contents(bus.get_inbox("receiver", since_tick=48, limit=10)) == ["m96", "m97", "m98", "m99"]
+
+    @pytest.mark.parametrize("limit", [None, 0, 3, SENT])
+    def test_inbox_json_matches_inbox(self, bus, limit):
+        inbox = bus.get_inbox("receiver", limit=limit)
+        assert json.loads(bus.get_inbox_json("receiver", limit=limit)) == [m.to_dict() for m in inbox]
+        assert bus.get_inbox_json("nobody") == b"[]"
+
+    def test_inbox_json_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(messaging, "HAS_ORJSON", False)
+        bus = MessageBus()
+        bus.send_message(tick=1, from_agent="sender", to_agent="receiver", content='quote " and \\ slash')
+        assert json.loads(bus.get_inbox_json("receiver")) == [m.to_dict() for m in bus.get_inbox("receiver")]
@@ -0,0 +1,141 @@
+"""
+Tests for the observer API's version-keyed response cache and ETags.
+
+The blueprint is mounted on a bare Flask app over in-memory state, with
+no engine running, so every change between requests is one the test made.
+"""
+
+import pytest
+from flask import Flask
+
+from observatory.communication.messaging import MessageBus
+from observatory.economy.accounting import AccountingLedger
+from observatory.economy.trade import TradeManager
+from observatory.ledger.events import EventLedger
+from observatory.ledger.replay import ReplayEngine
+from observatory.observer_api.app import create_observer_routes
+from observatory.world.resources import ResourcePool, ResourceType
+from observatory.world.state import AgentState, WorldState
+
+CACHED_PATHS = ["/api/observer/world/state", "/api/observer/agents", "/api/observer/analytics/summary"]
+
+
+class _World:
+    """The state objects behind the observer routes."""
+
+    def __init__(self):
+        self.world_state = WorldState(storage={})
+        self.world_state.initialize()
+        self.event_ledger = EventLedger("observer_cache_ledger.jsonl", storage={})
+        self.accounting = AccountingLedger()
+        self.message_bus = MessageBus()
+        self.trades = TradeManager(self.world_state, self.accounting)
+
+    def register(self, agent_id):
+        """Add an agent the way the /agent/register route does."""
+        self.world_state.add_agent(AgentState(
+            agent_id=agent_id, display_name=agent_id, public_key=f"key_{agent_id}",
+            region="nexus", resources=ResourcePool.create_default(), status="claimed",
+        ))
+        self.event_ledger.append({
+            "tick": self.world_state.tick, "action_type": "register",
+            "agent_id": agent_id, "success": True, "details": {},
+        })
+
+
+@pytest.fixture
+def world():
+    world = _World()
+    yield world
+    world.event_ledger.close()
+
+
+@pytest.fixture
+def client(world):
+    app = Flask(__name__)
+    app.register_blueprint(create_observer_routes(
+        world.world_state, world.event_ledger, ReplayEngine(world.event_ledger),
+        world.accounting, world.message_bus,
+    ))
+    return app.test_client()
+
+
+def _etag(response):
+    etag, _ = response.get_etag()
+    return etag
+
+
+class TestObserverCache:
+
+    @pytest.mark.parametrize("path", CACHED_PATHS)
+    def test_matching_etag_gets_304(self, client, path):
+        first = client.get(path)
+        assert first.status_code == 200 and _etag(first)
+
+        again = client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+        assert again.status_code == 304
+        assert again.data == b""
+        assert _etag(again) == _etag(first)
+
+    def test_cache_hit_skips_view(self, client, world, monkeypatch):
+        calls = []
+        snapshot = world.world_state.snapshot
+        monkeypatch.setattr(world.world_state, "snapshot", lambda: calls.append(1) or snapshot())
+
+        first = client.get("/api/observer/world/state")
+        second = client.get("/api/observer/world/state")
+        assert second.data == first.data
+        assert len(calls) == 1
+
+    def test_registration_between_ticks_invalidates(self, client, world):
+        before = client.get("/api/observer/agents")
+        world.register("newcomer")  # same tick
+
+        after = client.get("/api/observer/agents", headers={"If-None-Match": before.headers["ETag"]})
+        assert after.status_code == 200
+        assert "newcomer" in after.get_json()
+        assert _etag(after) != _etag(before)
+
+    def test_trade_between_ticks_invalidates(self, client, world):
+        world.register("seller")
+        world.register("buyer")
+        offer = world.trades.create_offer(world.world_state.tick, "seller", "buyer", "energy", 5.0, "memory", 3.0)
+        before = client.get("/api/observer/agents").get_json()
+
+        assert world.trades.accept_offer(offer.offer_id, "buyer", world.world_state.tick)["success"]
+        after = client.get("/api/observer/agents").get_json()
+        assert after["seller"]["resources"]["energy"] == before["seller"]["resources"]["energy"] - 5.0
+        assert after["buyer"]["resources"]["memory"] == before["buyer"]["resources"]["memory"] - 3.0
+
+    def test_reset_invalidates(self, client, world):
+        world.register("doomed")
+        before = client.get("/api/observer/agents")
+        assert "doomed" in before.get_json()
+
+        world.world_state.reset()  # tick and ledger counts may end up where they were
+        after = client.get("/api/observer/agents", headers={"If-None-Match": before.headers["ETag"]})
+        assert after.status_code == 200
+        assert after.get_json() == {}
+
+    def test_tick_invalidates(self, client, world):
+        before = client.get("/api/observer/world/state")
+        world.world_state.advance_tick()
+        after = client.get("/api/observer/world/state")
+        assert after.get_json()["tick"] == before.get_json()["tick"] + 1
+
+    def test_quiet_tick_changes_invalidate(self, client, world):
+        world.register("resting")
+        world.world_state.advance_tick()
+        before = client.get("/api/observer/agents")
+
+        # Danger lands after the tick advanced and logs no event
+        world.world_state.get_agent("resting").resources.deduct({ResourceType.ENERGY: 1.0})
+        world.world_state.mark_changed()
+        after = client.get("/api/observer/agents", headers={"If-None-Match": before.headers["ETag"]})
+        assert after.status_code == 200
+        assert after.get_json()["resting"]["resources"]["energy"] == before.get_json()["resting"]["resources"]["energy"] - 1.0
+
+    def test_paths_are_cached_separately(self, client):
+        state = client.get("/api/observer/world/state").get_json()
+        agents = client.get("/api/observer/agents").get_json()
+        assert "tick" in state and "tick" not in agents
@@ -0,0 +1,84 @@
+"""
+Tests for ReplayEngine: snapshot-cached replays must match a replay from tick 0.
+"""
+
+import pytest
+
+from observatory.ledger.events import EventLedger
+from observatory.ledger.replay import ReplayEngine
+
+INTERVAL = 10
+AGENTS = ("agent_a", "agent_b", "agent_c")
+
+
+def _event(tick, action_type, agent_id, **details):
+    return {"tick": tick, "action_type": action_type, "agent_id": agent_id,
+            "success": True, "details": details}
+
+
+@pytest.fixture
+def ledger():
+    ledger = EventLedger("replay_ledger.jsonl", storage={})
+    events = [
+        _event(1, "register", aid, spawn_region="nexus", initial_resources={"energy": 100.0})
+        for aid in AGENTS
+    ]
+    for tick in range(2, 60):
+        aid = AGENTS[tick % len(AGENTS)]
+        if tick % 7 == 0:
+            events.append(_event(tick, "move", aid, to_region="forge" if tick % 2 else "nexus"))
+        if tick == 15:
+            events.append(_event(tick, "claim", "agent_a", owner_identity="@owner"))
+        if tick == 25:
+            events.append(_event(tick, "ally", "agent_b", target_agent="agent_c"))
+        events.append(_event(tick, "tick", "world"))
+    # A late event: stamped tick 20 by a handler, appended after tick 21
+    late_at = next(i for i, e in enumerate(events) if e["tick"] == 22)
+    events.insert(late_at, _event(20, "move", "agent_c", to_region="wasteland"))
+    events.append(_event(45, "death", "agent_b"))
+    ledger.append_many(events)
+    yield ledger
+    ledger.close()
+
+
+def _engine(ledger, interval=INTERVAL):
+    engine = ReplayEngine(ledger)
+    engine.SNAPSHOT_INTERVAL = interval
+    return engine
+
+
+def _from_scratch(ledger, tick):
+    """Replay from tick 0 with no snapshot ever cached."""
+    return _engine(ledger, interval=10**9).reconstruct_at_tick(tick)
+
+
+class TestReplayEquivalence:
+
+    @pytest.mark.parametrize("target", [10, 19, 20, 21, 30, 44, 45, 50])
+    def test_cached_replay_matches_full_replay(self, ledger, target):
+        engine = _engine(ledger)
+        engine.reconstruct_at_tick(55)  # fills snapshots at every boundary
+        assert engine._snapshot_ticks
+        assert engine.reconstruct_at_tick(target) == _from_scratch(ledger, target)
+
+    def test_late_event_counted_once(self, ledger):
+        engine = _engine(ledger)
+        engine.reconstruct_at_tick(55)
+        result = engine.reconstruct_at_tick(20)
+        assert result["agents"]["agent_c"]["region"] == "wasteland"
+        assert result["total_events"] == _from_scratch(ledger, 20)["total_events"]
+
+    def test_returned_agents_cannot_corrupt_cache(self, ledger):
+        engine = _engine(ledger)
+        result = engine.reconstruct_at_tick(40)
+        agents = result["agents"]
+        agents["agent_a"]["status"] = "mutated"
+        agents["agent_a"]["resources"]["energy"] = -1.0
+        agents["agent_b"]["alliances"].append("intruder")
+        del agents["agent_c"]
+        result["regions"]["nexus"]["capacity"] = 0
+        result["regions"].clear()
+
+        assert engine.reconstruct_at_tick(40) == _from_scratch(ledger, 40)
+        assert engine.reconstruct_at_tick(42) == _from_scratch(ledger, 42)
+        assert ledger.get_events(action_type="register")[0].details["initial_resources"]["energy"] == 100.0
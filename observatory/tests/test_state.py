@@ -0,0 +1,130 @@
+"""
+Tests for WorldState persistence: snapshot formats and save ordering.
+"""
+
+import logging
+
+import pytest
+
+from observatory.world.resources import ResourcePool
+from observatory.world.state import HAS_ZSTD, AgentState, WorldState
+
+SUFFIXES = [".json", ".msgpack", ".json.gz", ".msgpack.gz", ".json.zst", ".msgpack.zst"]
+
+
+@pytest.fixture
+def world_state():
+    state = WorldState(storage={})
+    state.initialize()
+    return state
+
+
+@pytest.fixture
+def populated():
+    """A disk-backed world with agents in several states, a few ticks in."""
+    world_state = WorldState()
+    world_state.initialize()
+    for i, (region, status) in enumerate([("nexus", "claimed"), ("forge", "unclaimed"), ("nexus", "claimed")]):
+        world_state.add_agent(AgentState(
+            agent_id=f"agent_{i}",
+            display_name=f"Agent {i}",
+            public_key=f"key_{i}",
+            region=region,
+            resources=ResourcePool.create_default(),
+            status=status,
+            claim_token=f"claim_{i}" if status == "unclaimed" else None,
+            alliances=["agent_0"] if i else [],
+        ))
+    # Die the way the engine does it: status first, then leave the region
+    world_state.set_agent_status(world_state.get_agent("agent_2"), "dead")
+    world_state.remove_agent("agent_2")
+    world_state.pending_trades.append({"offer_id": "trade_00000001", "amount": 2.5})
+    for _ in range(3):
+        world_state.advance_tick()
+    return world_state
+
+
+def _persisted(state):
+    data = state.persist_snapshot()
+    del data["_seq"]
+    return data
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SAVE ORDERING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestSaveOrdering:
+
+    def test_older_snapshot_does_not_overwrite_newer(self, world_state):
+        path = "state.json"
+        old = world_state.persist_snapshot()
+        world_state.advance_tick()
+        world_state.save(path)
+        world_state.write_snapshot(old, path)  # a slow writer finishing late
+
+        reloaded = WorldState(storage=world_state._storage)
+        assert reloaded.load(path)
+        assert reloaded.tick == 1
+
+    def test_snapshot_is_detached_from_live_state(self, populated):
+        data = populated.persist_snapshot()
+        populated.pending_trades[0]["amount"] = 99.0
+        populated.get_agent("agent_1").alliances.append("intruder")
+        assert data["pending_trades"] == [{"offer_id": "trade_00000001", "amount": 2.5}]
+        assert data["agents"]["agent_1"]["alliances"] == ["agent_0"]
+
+    def test_sequence_is_not_persisted(self, world_state):
+        world_state.save("state.json")
+        assert b"_seq" not in world_state._storage["state.json"].getvalue()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SNAPSHOT FORMATS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestSnapshotFormats:
+
+    @pytest.mark.skipif(HAS_ZSTD, reason="zstandard is installed")
+    def test_zst_without_zstandard_warns(self, world_state, caplog):
+        with caplog.at_level(logging.WARNING, logger="observatory.state"):
+            world_state.save("warn_state.json.zst")
+        assert "zstandard is not installed" in caplog.text
+        assert WorldState(storage=world_state._storage).load("warn_state.json.zst")
+
+    @pytest.mark.parametrize("pretty", ["false", "true"])
+    @pytest.mark.parametrize("suffix", SUFFIXES)
+    def test_round_trip(self, populated, monkeypatch, tmp_path, suffix, pretty):
+        monkeypatch.setenv("OBSERVATORY_STATE_PRETTY", pretty)
+        path = str(tmp_path / f"state{suffix}")
+        populated.save(path)
+
+        reloaded = WorldState()
+        assert reloaded.load(path)
+        assert _persisted(reloaded) == _persisted(populated)
+        assert reloaded.analytics_snapshot() == populated.analytics_snapshot()
+        assert reloaded.get_agent_regions() == populated.get_agent_regions()
+        assert list(tmp_path.iterdir()) == [tmp_path / f"state{suffix}"]  # no temp files left
+
+    def test_pretty_is_indented(self, populated, monkeypatch, tmp_path):
+        monkeypatch.setenv("OBSERVATORY_STATE_PRETTY", "true")
+        populated.save(str(tmp_path / "pretty.json"))
+        monkeypatch.setenv("OBSERVATORY_STATE_PRETTY", "false")
+        populated.save(str(tmp_path / "compact.json"))
+        assert b"\n  " in (tmp_path / "pretty.json").read_bytes()
+        assert b"\n" not in (tmp_path / "compact.json").read_bytes()
+
+    @pytest.mark.parametrize("suffix", SUFFIXES)
+    def test_truncated_file_fails_load(self, populated, tmp_path, suffix):
+        path = tmp_path / f"state{suffix}"
+        populated.save(str(path))
+        raw = path.read_bytes()
+        path.write_bytes(raw[: len(raw) // 2])
+
+        reloaded = WorldState()
+        reloaded.initialize()
+        assert not reloaded.load(str(path))
+        assert reloaded.tick == 0 and reloaded.agents == {}
+
+    def test_missing_file_fails_load(self, tmp_path):
+        assert not WorldState().load(str(tmp_path / "absent.json"))
@@ -12,14 +12,33 @@ CRITICAL: The human website NEVER calls agent action endpoints.
 
 from __future__ import annotations
 
+import hashlib
+import io
 import json
 import logging
 import os
+import threading
 import time
-from functools import wraps
+from collections import OrderedDict
+from email.utils import formatdate
 from typing import Any, Dict, Optional
 
-from flask import Flask, Response, g, jsonify, render_template, request
+from flask import Flask, Response, jsonify, render_template, request
+from werkzeug.utils import get_content_type
+from werkzeug.wsgi import get_input_stream
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Serve with gunicorn if available, fallback to the Werkzeug server
+try:
+    from gunicorn.app.base import BaseApplication
+    HAS_GUNICORN = True
+except ImportError:
+    HAS_GUNICORN = False
 
 from observatory.agents.identity import (
     AntiSybil,
@@ -34,10 +53,11 @@ from observatory.communication.messaging import MessageBus
 from observatory.communication.noise import apply_noise
 from observatory.economy.accounting import AccountingLedger
 from observatory.economy.trade import TradeManager
-from observatory.ledger.events import EventLedger
+from observatory.ledger.events import EventLedger, dumps_with_raw
 from observatory.ledger.replay import ReplayEngine
 from observatory.observer_api.app import create_observer_routes
 from observatory.world.engine import WorldEngine
+from observatory.world.regions import communication_noise_factor
 from observatory.world.state import WorldState
 
 logger = logging.getLogger("observatory.web")
@@ -238,7 +258,7 @@ SKILL_JSON = json.dumps({
     "auth": {
         "method": "signed_request",
         "headers": ["X-Agent-ID", "X-Timestamp", "X-Signature"],
-        "signature_format": "HMAC-SHA256(public_key, METHOD:PATH:BODY:TIMESTAMP)",
+        "signature_format": "HMAC-SHA256(public_key, METHOD:PATH:BODY_BYTES:TIMESTAMP)",
     },
     "skill_files": {
         "skill": f"https://{DOMAIN}/skill.md",
@@ -250,9 +270,119 @@ SKILL_JSON = json.dumps({
 }, indent=2)
 
 
+# The content only changes on deploy, so import time stands in for mtime
+STATIC_LAST_MODIFIED = formatdate(time.time(), usegmt=True)
+STATIC_MAX_AGE = 300
+
+
+class _StaticFile:
+    """A fixed body encoded once, with its response headers prebuilt."""
+
+    __slots__ = ("body", "etag", "content_type", "headers")
+
+    def __init__(self, text: str, mimetype: str):
+        self.body = text.encode("utf-8")
+        self.etag = hashlib.sha256(self.body).hexdigest()[:16]
+        self.content_type = get_content_type(mimetype, "utf-8")
+        self.headers = (
+            ("ETag", f'"{self.etag}"'),
+            ("Cache-Control", f"public, max-age={STATIC_MAX_AGE}"),
+            ("Last-Modified", STATIC_LAST_MODIFIED),
+        )
+
+
+SKILL_FILES = {
+    "/skill.md": _StaticFile(SKILL_MD, "text/markdown"),
+    "/heartbeat.md": _StaticFile(HEARTBEAT_MD, "text/markdown"),
+    "/messaging.md": _StaticFile(MESSAGING_MD, "text/markdown"),
+    "/skill.json": _StaticFile(SKILL_JSON, "application/json"),
+}
+
+
+def _serve_static(static: _StaticFile) -> Response:
+    """Serve a fixed body, answering 304 when the client already has it."""
+    if request.if_none_match.contains(static.etag):
+        return Response(status=304, headers=static.headers)
+    return Response(static.body, headers=static.headers, content_type=static.content_type)
+
+
+CLAIM_PAGE_CACHE_SIZE = 2048
+
+MISSING_AUTH_BODY = json.dumps({"error": "Missing authentication headers"}).encode()
+
+
+AGENT_ID_KEY = "observatory.agent_id"  # WSGI environ key set by AgentAuthMiddleware
+
+
+class AgentAuthMiddleware:
+    """
+    WSGI middleware: require signed agent authentication.
+
+    Runs on the raw environ before Flask builds a request, for POSTs to
+    the protected agent paths only. On success the agent id is stored
+    under AGENT_ID_KEY and the buffered body is put back for the view.
+    """
+
+    PROTECTED_PATHS = frozenset({"/agent/observe", "/agent/action", "/agent/message"})
+
+    def __init__(self, wsgi_app, gateway: AgentGateway):
+        self.wsgi_app = wsgi_app
+        self.gateway = gateway
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path not in self.PROTECTED_PATHS or environ.get("REQUEST_METHOD") != "POST":
+            return self.wsgi_app(environ, start_response)
+
+        agent_id = environ.get("HTTP_X_AGENT_ID")
+        timestamp = environ.get("HTTP_X_TIMESTAMP")
+        signature = environ.get("HTTP_X_SIGNATURE")
+        if not (agent_id and timestamp and signature):
+            return self._reject(start_response, "401 Unauthorized", MISSING_AUTH_BODY)
+
+        # Raw bytes: the signature covers the body exactly as sent
+        body = get_input_stream(environ).read()
+        environ["wsgi.input"] = io.BytesIO(body)
+        environ["CONTENT_LENGTH"] = str(len(body))
+        environ.pop("wsgi.input_terminated", None)
+
+        error = self.gateway.authenticate_request(
+            agent_id=agent_id,
+            method="POST",
+            path=path,
+            body=body,
+            timestamp=timestamp,
+            signature=signature,
+        )
+        if error:
+            return self._reject(start_response, "403 Forbidden", json.dumps({"error": error}).encode())
+
+        environ[AGENT_ID_KEY] = agent_id
+        return self.wsgi_app(environ, start_response)
+
+    @staticmethod
+    def _reject(start_response, status: str, body: bytes):
+        start_response(status, [
+            ("Content-Type", "application/json"),
+            ("Content-Length", str(len(body))),
+        ])
+        return [body]
+
+
+def _json(payload) -> Response:
+    """Encode an agent gateway response body."""
+    if HAS_ORJSON:
+        return Response(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS), mimetype="application/json")
+    return jsonify(payload)
+
+
 # ─── App factory ──────────────────────────────────────────────────────────────
 
-def create_app(tick_duration: float = 5.0) -> Flask:
+def create_app(tick_duration: float = 5.0, state_backend: str = "file") -> Flask:
+    """
+    Build the app. state_backend="memory" keeps world state and the event
+    ledger in in-memory buffers instead of files (used by the tests).
+    """
     app = Flask(
         __name__,
         template_folder=os.path.join(os.path.dirname(__file__), "templates"),
@@ -261,17 +391,23 @@ def create_app(tick_duration: float = 5.0) -> Flask:
     app.config["SECRET_KEY"] = os.environ.get("OBSERVATORY_SECRET", "observatory-dev-secret")
 
     # ── Initialize world ──────────────────────────────────────────────────
-    world_state = WorldState()
+    storage: Optional[Dict[str, io.BytesIO]] = {} if state_backend == "memory" else None
+    world_state = WorldState(storage=storage)
     if not world_state.load():
         world_state.initialize()
         world_state.save()
 
-    event_ledger = EventLedger()
+    event_ledger = EventLedger(storage=storage)
 
     def on_event(event_data: dict):
         event_ledger.append(event_data)
 
-    engine = WorldEngine(world_state, tick_duration=tick_duration, on_event=on_event)
+    engine = WorldEngine(
+        world_state,
+        tick_duration=tick_duration,
+        on_event=on_event,
+        on_events=event_ledger.append_many,
+    )
     gateway = AgentGateway(world_state, engine, domain=DOMAIN)
     lifecycle = LifecycleManager(world_state)
     accounting = AccountingLedger()
@@ -291,61 +427,38 @@ def create_app(tick_duration: float = 5.0) -> Flask:
     app.accounting = accounting
     app.trade_manager = trade_manager
     app.message_bus = message_bus
+    app.replay = replay
 
     # ── Skill file routes (public, plain-text) ────────────────────────────
 
     @app.route("/skill.md")
     def serve_skill_md():
-        return Response(SKILL_MD, mimetype="text/markdown")
+        return _serve_static(SKILL_FILES["/skill.md"])
 
     @app.route("/heartbeat.md")
     def serve_heartbeat_md():
-        return Response(HEARTBEAT_MD, mimetype="text/markdown")
+        return _serve_static(SKILL_FILES["/heartbeat.md"])
 
     @app.route("/messaging.md")
     def serve_messaging_md():
-        return Response(MESSAGING_MD, mimetype="text/markdown")
+        return _serve_static(SKILL_FILES["/messaging.md"])
 
     @app.route("/skill.json")
     def serve_skill_json():
-        return Response(SKILL_JSON, mimetype="application/json")
+        return _serve_static(SKILL_FILES["/skill.json"])
 
     # ── Agent Gateway (WRITE) ─────────────────────────────────────────────
     # These endpoints are ONLY for agents. Signed request auth required
-    # (except register which uses PoW + signed nonce).
-
-    def require_agent_auth(f):
-        """Decorator: require signed agent authentication."""
-        @wraps(f)
-        def decorated(*args, **kwargs):
-            agent_id = request.headers.get("X-Agent-ID")
-            timestamp = request.headers.get("X-Timestamp")
-            signature = request.headers.get("X-Signature")
-
-            if not all([agent_id, timestamp, signature]):
-                return jsonify({"error": "Missing authentication headers"}), 401
-
-            body = request.get_data(as_text=True)
-            error = gateway.authenticate_request(
-                agent_id=agent_id,
-                method=request.method,
-                path=request.path,
-                body=body,
-                timestamp=timestamp,
-                signature=signature,
-            )
-            if error:
-                return jsonify({"error": error}), 403
+    # (except register which uses PoW + signed nonce); AgentAuthMiddleware
+    # enforces it before the request reaches Flask.
 
-            g.agent_id = agent_id
-            return f(*args, **kwargs)
-        return decorated
+    app.wsgi_app = AgentAuthMiddleware(app.wsgi_app, gateway)
 
     @app.route("/agent/register/challenge", methods=["POST"])
     def agent_register_challenge():
         """Step 1: Get PoW challenge for registration."""
         result = gateway.request_registration_challenge()
-        return jsonify(result)
+        return _json(result)
 
     @app.route("/agent/register", methods=["POST"])
     def agent_register():
@@ -371,7 +484,7 @@ def create_app(tick_duration: float = 5.0) -> Flask:
                     "initial_resources": result.initial_resources,
                 },
             })
-            return jsonify({
+            return _json({
                 "success": True,
                 "agent_id": result.agent_id,
                 "claim_token": result.claim_token,
@@ -381,28 +494,30 @@ def create_app(tick_duration: float = 5.0) -> Flask:
                 "auth_method": "signed_requests",
                 "instructions": "Return the claim_url to your human operator for ownership verification.",
             })
-        return jsonify({"success": False, "error": result.error}), 400
+        return _json({"success": False, "error": result.error}), 400
 
     @app.route("/agent/observe", methods=["POST"])
-    @require_agent_auth
     def agent_observe():
         """Agent observe — see surroundings and inbox."""
-        result = gateway.agent_observe(g.agent_id)
+        agent_id = request.environ[AGENT_ID_KEY]
+        result = gateway.agent_observe(agent_id)
         if result.success:
-            # Include inbox messages
-            inbox = message_bus.get_inbox(g.agent_id)
             details = result.details or {}
-            details["inbox"] = [m.to_dict() for m in inbox[-20:]]  # last 20 messages
             # Include pending trade offers
-            offers = trade_manager.get_offers_for_agent(g.agent_id)
+            offers = trade_manager.get_offers_for_agent(agent_id)
             details["pending_trades"] = [o.to_dict() for o in offers]
-            return jsonify({"success": True, **details})
-        return jsonify({"success": False, "error": result.error}), 400
+            # Include inbox messages, spliced in already encoded
+            inbox = message_bus.get_inbox_json(agent_id, limit=20)  # last 20 messages
+            return Response(
+                dumps_with_raw({"success": True, **details}, "inbox", inbox),
+                mimetype="application/json",
+            )
+        return _json({"success": False, "error": result.error}), 400
 
     @app.route("/agent/action", methods=["POST"])
-    @require_agent_auth
     def agent_action():
         """Agent action — submit an action to the world."""
+        agent_id = request.environ[AGENT_ID_KEY]
         data = request.get_json(force=True, silent=True) or {}
         action_type = data.get("action_type", "")
         params = data.get("params", {})
@@ -410,82 +525,96 @@ def create_app(tick_duration: float = 5.0) -> Flask:
         # Handle trade acceptance specially
         if action_type == "accept_trade":
             offer_id = params.get("offer_id")
-            result = trade_manager.accept_offer(offer_id, g.agent_id, world_state.tick)
-            return jsonify(result)
+            result = trade_manager.accept_offer(offer_id, agent_id, world_state.tick)
+            return _json(result)
 
-        result = gateway.submit_action(g.agent_id, action_type, params)
+        result = gateway.submit_action(agent_id, action_type, params)
         if result.success:
             # If it's a trade creation, also create the trade offer object
             if action_type == "trade":
                 trade_manager.create_offer(
-                    tick=world_state.tick,
-                    from_agent=g.agent_id,
+                    tick=result.details["queued_at_tick"],
+                    from_agent=agent_id,
                     to_agent=params.get("target_agent", ""),
                     offer_resource=params.get("offer_resource", ""),
                     offer_amount=params.get("offer_amount", 0),
                     request_resource=params.get("request_resource", ""),
                     request_amount=params.get("request_amount", 0),
                 )
-            return jsonify({"success": True, "action_type": action_type, "details": result.details})
-        return jsonify({"success": False, "error": result.error}), 400
+            return _json({"success": True, "action_type": action_type, "details": result.details})
+        return _json({"success": False, "error": result.error}), 400
 
     @app.route("/agent/message", methods=["POST"])
-    @require_agent_auth
     def agent_message():
         """Agent message — send a message to another agent."""
+        agent_id = request.environ[AGENT_ID_KEY]
         data = request.get_json(force=True, silent=True) or {}
         target_agent = data.get("target_agent", "")
         content = data.get("content", "")
 
         if not target_agent or not content:
-            return jsonify({"error": "Missing target_agent or content"}), 400
+            return _json({"error": "Missing target_agent or content"}), 400
 
         # Submit as an action (costs resources)
         result = gateway.submit_action(
-            g.agent_id,
+            agent_id,
             "send_message",
             {"target_agent": target_agent, "content": content},
         )
         if result.success:
             # Also deliver message immediately via message bus
-            agent = world_state.get_agent(g.agent_id)
-            target = world_state.get_agent(target_agent)
+            agent, target, source_region, target_region = world_state.resolve_message_context(
+                agent_id, target_agent,
+            )
             if agent and target:
-                from observatory.world.regions import communication_noise_factor
-                source_region = world_state.region_manager.get(agent.region)
-                target_region = world_state.region_manager.get(target.region)
                 noise = 0.0
-                if source_region and target_region:
+                # Same region is always noise-free
+                if agent.region != target.region and source_region and target_region:
                     noise = communication_noise_factor(source_region, target_region)
                 message_bus.send_message(
-                    tick=world_state.tick,
-                    from_agent=g.agent_id,
+                    tick=result.details["queued_at_tick"],
+                    from_agent=agent_id,
                     to_agent=target_agent,
                     content=content,
                     noise_factor=noise,
                     sender_region=agent.region,
                     receiver_region=target.region,
                 )
-            return jsonify({"success": True, "queued": True})
-        return jsonify({"success": False, "error": result.error}), 400
+            return _json({"success": True, "queued": True})
+        return _json({"success": False, "error": result.error}), 400
 
     # ── Claim verification (human-facing) ─────────────────────────────────
 
+    claim_pages: "OrderedDict[str, str]" = OrderedDict()  # claim_token -> rendered claim.html
+    claim_pages_lock = threading.Lock()
+
     @app.route("/claim/<claim_token>", methods=["GET"])
     def claim_page(claim_token):
         """Human opens claim URL — shows verification instructions."""
         try:
+            # Validate on every hit (rate limit, expiry, status); only the
+            # rendering is cached, since it is a pure function of the token.
             info = lifecycle.get_verification_phrase(claim_token)
-            return render_template(
-                "claim.html",
-                claim_token=claim_token,
-                agent_id=info["agent_id"],
-                display_name=info["display_name"],
-                verification_phrase=info["verification_phrase"],
-                short_code=info["short_code"],
-                instructions=info["instructions"],
-                domain=DOMAIN,
-            )
+            with claim_pages_lock:
+                html = claim_pages.get(claim_token)
+                if html is not None:
+                    claim_pages.move_to_end(claim_token)
+            if html is None:
+                html = render_template(
+                    "claim.html",
+                    claim_token=claim_token,
+                    agent_id=info["agent_id"],
+                    display_name=info["display_name"],
+                    verification_phrase=info["verification_phrase"],
+                    short_code=info["short_code"],
+                    instructions=info["instructions"],
+                    domain=DOMAIN,
+                )
+                with claim_pages_lock:
+                    claim_pages[claim_token] = html
+                    while len(claim_pages) > CLAIM_PAGE_CACHE_SIZE:
+                        claim_pages.popitem(last=False)
+            return html
         except ClaimError as e:
             return render_template("claim_error.html", error=str(e)), 400
 
@@ -508,6 +637,8 @@ def create_app(tick_duration: float = 5.0) -> Flask:
                 owner_identity=owner_identity,
                 verification_method=verification_method,
             )
+            with claim_pages_lock:
+                claim_pages.pop(claim_token, None)
             # Record claim event
             event_ledger.append({
                 "tick": world_state.tick,
@@ -530,23 +661,51 @@ def create_app(tick_duration: float = 5.0) -> Flask:
 
     # ── Human-facing website (READ-ONLY) ──────────────────────────────────
 
+    # These pages only depend on DOMAIN and PROJECT_NAME, so each is
+    # rendered on its first request (url_for needs a request context)
+    # and served from the cached bytes afterwards.
+    pages: Dict[str, _StaticFile] = {}
+
+    def _render_page(template: str) -> Response:
+        page = pages.get(template)
+        if page is None:
+            html = render_template(template, domain=DOMAIN, project_name=PROJECT_NAME)
+            page = pages[template] = _StaticFile(html, "text/html")
+        return _serve_static(page)
+
     @app.route("/")
     def homepage():
-        return render_template("index.html", domain=DOMAIN, project_name=PROJECT_NAME)
+        return _render_page("index.html")
 
     @app.route("/register")
     def register_page():
-        return render_template("register.html", domain=DOMAIN, project_name=PROJECT_NAME)
+        return _render_page("register.html")
 
     @app.route("/observe")
     def observe_page():
         """Observer UI entry point."""
-        return render_template("observe.html", domain=DOMAIN, project_name=PROJECT_NAME)
+        return _render_page("observe.html")
 
     # ── Observer API (READ-ONLY) ──────────────────────────────────────────
     observer_bp = create_observer_routes(world_state, event_ledger, replay, accounting, message_bus)
     app.register_blueprint(observer_bp)
 
+    def reset_state() -> None:
+        """Return every component to a fresh world, keeping object identity."""
+        world_state.reset()
+        engine.reset()
+        event_ledger.reset()
+        replay.reset()
+        accounting.reset()
+        trade_manager.reset()
+        message_bus.reset()
+        gateway.reset()
+        lifecycle.reset()
+        with claim_pages_lock:
+            claim_pages.clear()
+
+    app.reset_state = reset_state
+
     return app
 
 
@@ -557,9 +716,40 @@ def main():
     port = int(os.environ.get("OBSERVATORY_PORT", "8000"))
     debug = os.environ.get("OBSERVATORY_DEBUG", "false").lower() == "true"
 
+    if HAS_GUNICORN and not debug:
+        _run_gunicorn(host, port, tick_duration)
+        return
+
     app = create_app(tick_duration=tick_duration)
     app.run(host=host, port=port, debug=debug)
 
 
+def _run_gunicorn(host: str, port: int, tick_duration: float) -> None:
+    """
+    Serve with gunicorn's threaded worker and keep-alive.
+
+    World state and the tick engine live in-process, so there is exactly
+    one worker; concurrency comes from its threads. The app is built in
+    the worker, after the fork, so the engine thread runs there.
+    """
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": 1,
+        "worker_class": "gthread",
+        "threads": int(os.environ.get("OBSERVATORY_THREADS", "8")),
+        "keepalive": 30,
+    }
+
+    class _Server(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return create_app(tick_duration=tick_duration)
+
+    _Server().run()
+
+
 if __name__ == "__main__":
     main()
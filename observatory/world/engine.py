@@ -10,7 +10,9 @@ Discrete tick loop that:
 
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
 import threading
 import time
 from collections import deque
@@ -19,12 +21,12 @@ from typing import Any, Callable, Deque, Dict, List, Optional
 
 from observatory.world.rules import ActionResult, RulesEngine
 from observatory.world.state import AgentState, WorldState
-from observatory.world.resources import ResourcePool
+from observatory.world.resources import ENERGY, ResourcePool
 
 logger = logging.getLogger("observatory.engine")
 
 
-@dataclass
+@dataclass(slots=True)
 class QueuedAction:
     agent_id: str
     action_type: str
@@ -37,34 +39,72 @@ class WorldEngine:
     """
     The world engine runs a discrete tick loop.
     Actions are queued between ticks and resolved deterministically each tick.
+    World state is saved every save_every_n_ticks ticks and on stop().
+    A "tick" heartbeat event follows every tick that produced results;
+    quiet ticks only emit one every heartbeat_every_n_ticks ticks.
     """
 
+    SAVE_EVERY_N_TICKS = 10
+    HEARTBEAT_EVERY_N_TICKS = 10
+    # Consecutive overrunning ticks before a warning is logged
+    TICK_OVERRUN_WARN_AFTER = 3
+
     def __init__(
         self,
         world_state: WorldState,
         tick_duration: float = 5.0,
         on_event: Optional[Callable[[dict], None]] = None,
+        on_events: Optional[Callable[[List[dict]], None]] = None,
+        save_every_n_ticks: int = SAVE_EVERY_N_TICKS,
+        heartbeat_every_n_ticks: int = HEARTBEAT_EVERY_N_TICKS,
     ) -> None:
         self.world_state = world_state
         self.tick_duration = tick_duration
+        self.save_every_n_ticks = max(1, save_every_n_ticks)
+        self._ticks_since_save = 0
+        self.heartbeat_every_n_ticks = max(1, heartbeat_every_n_ticks)
         self.rules_engine = RulesEngine(world_state.region_manager)
+        # deque append/popleft are atomic, so submitters never take a lock
         self._action_queue: Deque[QueuedAction] = deque()
-        self._queue_lock = threading.Lock()
         self._running = False
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        # Ticks that ran past their slot on the monotonic tick grid
+        self.tick_overrun_count = 0
+        # Snapshots waiting for the persist worker; None asks it to exit
+        self._persist_queue: "queue.SimpleQueue[Optional[dict]]" = queue.SimpleQueue()
+        self._persist_thread: Optional[threading.Thread] = None
         self._on_event = on_event  # callback for appending to event ledger
+        self._on_events = on_events  # batch variant, preferred when given
+
+    def reset(self) -> None:
+        """Discard queued actions; goes with WorldState.reset()."""
+        self._action_queue.clear()
+        self._ticks_since_save = 0
 
     def enqueue_action(self, action: QueuedAction) -> None:
-        with self._queue_lock:
-            self._action_queue.append(action)
+        self._action_queue.append(action)
+
+    def _drain_actions(self) -> List[QueuedAction]:
+        """Take every queued action; anything enqueued meanwhile waits a tick."""
+        actions: List[QueuedAction] = []
+        pop = self._action_queue.popleft
+        try:
+            for _ in range(len(self._action_queue)):
+                actions.append(pop())
+        except IndexError:
+            pass
+        return actions
 
     def start(self) -> None:
         if self._running:
             return
         self._running = True
+        self._persist_thread = threading.Thread(target=self._persist_loop, daemon=True)
+        self._persist_thread.start()
         self._thread = threading.Thread(target=self._tick_loop, daemon=True)
         self._thread.start()
+        atexit.register(self.stop)
         logger.info("World engine started. Tick duration: %.1fs", self.tick_duration)
 
     def stop(self) -> None:
@@ -72,17 +112,70 @@ class WorldEngine:
         self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=5.0)
+        if self._persist_thread:
+            self._persist_queue.put(None)
+            self._persist_thread.join(timeout=5.0)
+            self._persist_thread = None
+        atexit.unregister(self.stop)
+        self._save_if_dirty()
         logger.info("World engine stopped.")
 
+    def _save_if_dirty(self) -> None:
+        """Snapshot state if any tick is unsaved; write it on the persist worker if running."""
+        if not self._ticks_since_save:
+            return
+        data = self.world_state.persist_snapshot()
+        self._ticks_since_save = 0
+        if self._persist_thread is not None:
+            self._persist_queue.put(data)
+        else:
+            self.world_state.write_snapshot(data)
+
+    def _persist_loop(self) -> None:
+        """Write queued snapshots in order, skipping any already superseded."""
+        while True:
+            data = self._persist_queue.get()
+            stop = data is None
+            # Only the newest queued snapshot is worth writing
+            while not self._persist_queue.empty():
+                newer = self._persist_queue.get()
+                if newer is None:
+                    stop = True
+                else:
+                    data = newer
+            if data is not None:
+                try:
+                    self.world_state.write_snapshot(data)
+                except Exception:
+                    logger.exception("Error saving world state at tick %d", data["tick"])
+            if stop:
+                return
+
     def _tick_loop(self) -> None:
+        # Ticks start on an absolute monotonic grid so a slow tick does not push back every later one
+        deadline = time.monotonic() + self.tick_duration
+        consecutive_overruns = 0
         while self._running:
-            start = time.monotonic()
             try:
                 self._process_tick()
             except Exception:
                 logger.exception("Error processing tick %d", self.world_state.tick)
-            elapsed = time.monotonic() - start
-            sleep_time = max(0, self.tick_duration - elapsed)
+            now = time.monotonic()
+            sleep_time = deadline - now
+            if sleep_time > 0:
+                consecutive_overruns = 0
+                deadline += self.tick_duration
+            else:
+                self.tick_overrun_count += 1
+                consecutive_overruns += 1
+                if consecutive_overruns == self.TICK_OVERRUN_WARN_AFTER:
+                    logger.warning(
+                        "Tick overrun: %d consecutive ticks exceeded %.2fs (tick %d)",
+                        consecutive_overruns, self.tick_duration, self.world_state.tick,
+                    )
+                # Re-anchor instead of firing a burst of catch-up ticks
+                sleep_time = 0.0
+                deadline = now + self.tick_duration
             # Use event-based sleep for clean shutdown
             self._stop_event.wait(timeout=sleep_time)
 
@@ -91,22 +184,24 @@ class WorldEngine:
         logger.debug("Processing tick %d", tick)
 
         # 1. Drain action queue
-        with self._queue_lock:
-            actions = list(self._action_queue)
-            self._action_queue.clear()
+        actions = self._drain_actions()
 
-        # Filter expired actions
-        valid_actions = [
-            a for a in actions
-            if (tick - a.submitted_at_tick) <= a.valid_for_ticks
-        ]
+        # Start-of-tick agent regions; skipped on ticks with no actions
+        agent_regions = self.world_state.get_agent_regions() if actions else {}
 
-        all_agents_summary = self.world_state.get_all_agents_summary()
-
-        # 2. Resolve each action deterministically
+        # 2. Resolve each action deterministically, in submission order.
+        # Expiry filtering is fused into the same pass.
         results: List[ActionResult] = []
-        for action in valid_actions:
-            agent = self.world_state.get_agent(action.agent_id)
+        agents = self.world_state.agents
+        resolve = self.rules_engine.validate_and_resolve
+        apply_side_effects = self._apply_side_effects
+        actions_processed = 0
+        for action in actions:
+            if (tick - action.submitted_at_tick) > action.valid_for_ticks:
+                continue
+            actions_processed += 1
+
+            agent = agents.get(action.agent_id)
             if not agent or not agent.is_alive():
                 continue
 
@@ -122,45 +217,60 @@ class WorldEngine:
                 ))
                 continue
 
-            result = self.rules_engine.validate_and_resolve(
+            result = resolve(
                 action_type=action.action_type,
                 agent_id=action.agent_id,
                 agent_resources=agent.resources,
                 agent_region=agent.region,
                 params=action.params,
                 tick=tick,
-                all_agents=all_agents_summary,
+                agent_regions=agent_regions,
             )
             results.append(result)
 
             # Apply side effects for successful actions
             if result.success:
-                self._apply_side_effects(result, agent)
-
-        # 3. Apply per-agent tick effects (regen, danger)
-        for agent_id, agent in list(self.world_state.agents.items()):
-            if not agent.is_alive():
-                continue
-
-            region = self.world_state.region_manager.get(agent.region)
-            multiplier = region.resource_multiplier if region else 1.0
-            agent.resources.regenerate(multiplier)
-
-            # Apply danger
-            death = self.rules_engine.apply_danger(agent_id, agent.resources, agent.region, tick)
-            if death:
-                agent.status = "dead"
-                agent.died_at_tick = tick
-                self.world_state.remove_agent(agent_id)
-                results.append(death)
-
-        # 4. Persist state
-        self.world_state.save()
+                apply_side_effects(result, agent)
+
+        # 3. Apply per-agent tick effects (regen, danger).
+        # Iterate agents in place under the state lock; removals wait until
+        # after the sweep. Holding the lock for the pass is the price of not
+        # copying the agent table every tick.
+        regions = self.world_state.region_manager.regions
+        apply_danger = self.rules_engine.apply_danger
+        world_state = self.world_state
+        dead_ids: List[str] = []
+        with world_state.lock:
+            for agent_id, agent in world_state.agents.items():
+                if not agent.is_alive():
+                    continue
+
+                region = regions.get(agent.region)
+                multiplier = region.resource_multiplier if region else 1.0
+                agent.resources.regenerate(multiplier)
+
+                # Apply danger
+                death = apply_danger(agent_id, agent.resources, agent.region, tick, region=region)
+                if death:
+                    world_state.set_agent_status(agent, "dead")
+                    agent.died_at_tick = tick
+                    dead_ids.append(agent_id)
+                    results.append(death)
+            for agent_id in dead_ids:
+                world_state.remove_agent(agent_id)
+        # Quiet ticks log no event, so tell version-keyed caches directly
+        world_state.mark_changed()
+
+        # 4. Persist state (coalesced; the event ledger has every tick)
+        self._ticks_since_save += 1
+        if self._ticks_since_save >= self.save_every_n_ticks:
+            self._save_if_dirty()
 
         # 5. Emit events
-        if self._on_event:
-            for result in results:
-                event = {
+        heartbeat = bool(results) or tick % self.heartbeat_every_n_ticks == 0
+        if (self._on_event or self._on_events) and heartbeat:
+            events = [
+                {
                     "tick": tick,
                     "action_type": result.action_type,
                     "agent_id": result.agent_id,
@@ -168,27 +278,36 @@ class WorldEngine:
                     "details": result.details,
                     "error": result.error,
                 }
-                self._on_event(event)
+                for result in results
+            ]
 
-            # Emit tick heartbeat event
-            self._on_event({
+            # Tick heartbeat event
+            total_agents, alive_agents, _ = self.world_state.analytics_snapshot()
+            events.append({
                 "tick": tick,
                 "action_type": "tick",
                 "agent_id": "__world__",
                 "success": True,
                 "details": {
-                    "actions_processed": len(valid_actions),
+                    "actions_processed": actions_processed,
                     "results": len(results),
-                    "total_agents": len(self.world_state.agents),
-                    "alive_agents": sum(1 for a in self.world_state.agents.values() if a.is_alive()),
+                    "total_agents": total_agents,
+                    "alive_agents": alive_agents,
+                    "tick_overrun_count": self.tick_overrun_count,
                 },
                 "error": None,
             })
 
+            if self._on_events:
+                self._on_events(events)
+            else:
+                for event in events:
+                    self._on_event(event)
+
     def _apply_side_effects(self, result: ActionResult, agent: AgentState) -> None:
         """Apply successful action side effects to world state."""
         if result.action_type == "move":
-            agent.region = result.details["to_region"]
+            self.world_state.set_agent_region(agent, result.details["to_region"])
 
         elif result.action_type == "fork":
             child_id = result.details.get("child_name", f"{agent.agent_id}_fork")
@@ -219,7 +338,7 @@ class WorldEngine:
                     current = agent.resources.holdings.get(rtype, 0)
                     cap = agent.resources.caps.get(rtype, 100)
                     agent.resources.holdings[rtype] = min(current + amount, cap)
-                absorbed.status = "dead"
+                self.world_state.set_agent_status(absorbed, "dead")
                 absorbed.died_at_tick = result.tick
                 self.world_state.remove_agent(absorbed_id)
 
@@ -228,11 +347,11 @@ class WorldEngine:
             target = self.world_state.get_agent(target_id)
             if target:
                 damage = result.details["attacker_strength"] * 0.3
-                from observatory.world.resources import ResourceType
-                target_energy = target.resources.holdings.get(ResourceType.ENERGY, 0)
-                target.resources.holdings[ResourceType.ENERGY] = max(0, target_energy - damage)
-                if target.resources.holdings[ResourceType.ENERGY] <= 0:
-                    target.status = "dead"
+                holdings = target.resources.holdings
+                target_energy = max(0, holdings.get(ENERGY, 0) - damage)
+                holdings[ENERGY] = target_energy
+                if target_energy <= 0:
+                    self.world_state.set_agent_status(target, "dead")
                     target.died_at_tick = result.tick
                     self.world_state.remove_agent(target_id)
 
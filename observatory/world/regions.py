@@ -7,12 +7,18 @@ Proximity affects action cost and communication risk.
 
 from __future__ import annotations
 
+import itertools
 import math
+import threading
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+# One counter for every region, so a region rebuilt by load() or reset()
+# never reuses a version that an observe cache may still hold
+_versions = itertools.count(1)
 
-@dataclass
+
+@dataclass(slots=True)
 class Region:
     """A discrete spatial zone in the world."""
 
@@ -24,22 +30,41 @@ class Region:
     resource_multiplier: float = 1.0  # affects regen rates
     danger_level: float = 0.0  # 0.0 = safe, 1.0 = lethal
     capacity: int = 100  # max agents
-    current_agents: List[str] = field(default_factory=list)
+    # Insertion-ordered set: O(1) membership, stable iteration order
+    current_agents: Dict[str, None] = field(default_factory=dict)
+    # Per-region lock: the capacity check and insert must not interleave
+    # between the tick thread (moves) and request threads (registration)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    # Changes whenever the occupants or one of their statuses change
+    version: int = field(default_factory=lambda: next(_versions), init=False, repr=False, compare=False)
 
     def is_full(self) -> bool:
         return len(self.current_agents) >= self.capacity
 
     def add_agent(self, agent_id: str) -> bool:
-        if self.is_full() or agent_id in self.current_agents:
-            return False
-        self.current_agents.append(agent_id)
-        return True
+        with self._lock:
+            if self.is_full() or agent_id in self.current_agents:
+                return False
+            self.current_agents[agent_id] = None
+            self.version = next(_versions)
+            return True
 
     def remove_agent(self, agent_id: str) -> bool:
-        if agent_id not in self.current_agents:
-            return False
-        self.current_agents.remove(agent_id)
-        return True
+        with self._lock:
+            if agent_id not in self.current_agents:
+                return False
+            del self.current_agents[agent_id]
+            self.version = next(_versions)
+            return True
+
+    def touch(self) -> None:
+        """Mark an occupant as changed in place, e.g. a new status."""
+        self.version = next(_versions)
+
+    def agent_ids(self) -> List[str]:
+        """Copy of the occupants, safe to iterate while agents move."""
+        with self._lock:
+            return list(self.current_agents)
 
     def to_dict(self) -> dict:
         return {
@@ -56,7 +81,7 @@ class Region:
 
 
 def distance(a: Region, b: Region) -> float:
-    return math.sqrt((a.x - b.x) ** 2 + (a.y - b.y) ** 2)
+    return math.hypot(a.x - b.x, a.y - b.y)
 
 
 def movement_cost_multiplier(a: Region, b: Region) -> float:
@@ -154,7 +179,6 @@ class RegionManager:
         mgr = cls()
         for rid, rdata in data.items():
             agents = rdata.pop("agent_count", 0)
-            if "current_agents" not in rdata:
-                rdata["current_agents"] = []
+            rdata["current_agents"] = dict.fromkeys(rdata.get("current_agents", ()))
             mgr.regions[rid] = Region(**rdata)
         return mgr
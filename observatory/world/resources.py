@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import enum
 from dataclasses import dataclass, field
-from typing import Dict
+from typing import Dict, Tuple, Union
 
 
 class ResourceType(str, enum.Enum):
@@ -19,6 +19,18 @@ class ResourceType(str, enum.Enum):
     COMPUTE = "compute"
 
 
+# Members bound once at import; attribute lookup on an Enum class costs
+# roughly twice as much as the dict access it feeds in the tick hot paths
+ENERGY, BANDWIDTH, MEMORY, COMPUTE = ResourceType
+
+# ResourceType -> its string value; .value is a property and costs a
+# descriptor call per access, which dominates to_dict on save and snapshot
+RESOURCE_NAMES: Dict[ResourceType, str] = {rtype: rtype.value for rtype in ResourceType}
+
+# Costs as precomputed (type, amount) rows, or as a plain mapping
+CostRows = Tuple[Tuple[ResourceType, float], ...]
+Costs = Union[Dict[ResourceType, float], CostRows]
+
 # Default caps and regeneration rates per tick
 RESOURCE_DEFAULTS: Dict[ResourceType, Dict[str, float]] = {
     ResourceType.ENERGY: {"cap": 100.0, "regen": 2.0, "initial": 50.0},
@@ -27,6 +39,11 @@ RESOURCE_DEFAULTS: Dict[ResourceType, Dict[str, float]] = {
     ResourceType.COMPUTE: {"cap": 80.0, "regen": 1.5, "initial": 40.0},
 }
 
+# (type, regen per tick, default cap), unpacked once for ResourcePool.regenerate
+_REGEN_TABLE = tuple(
+    (rtype, defaults["regen"], defaults["cap"]) for rtype, defaults in RESOURCE_DEFAULTS.items()
+)
+
 # Costs for standard actions
 ACTION_COSTS: Dict[str, Dict[ResourceType, float]] = {
     "move": {ResourceType.ENERGY: 5.0},
@@ -39,8 +56,13 @@ ACTION_COSTS: Dict[str, Dict[ResourceType, float]] = {
     "ally": {ResourceType.ENERGY: 3.0, ResourceType.BANDWIDTH: 2.0},
 }
 
+# Flattened (type, amount) rows of ACTION_COSTS for the per-action hot path
+ACTION_COST_ITEMS: Dict[str, CostRows] = {
+    action_type: tuple(costs.items()) for action_type, costs in ACTION_COSTS.items()
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class ResourcePool:
     """Tracks an agent's resource holdings."""
 
@@ -55,28 +77,39 @@ class ResourcePool:
             pool.caps[rtype] = defaults["cap"]
         return pool
 
-    def can_afford(self, costs: Dict[ResourceType, float]) -> bool:
-        for rtype, amount in costs.items():
-            if self.holdings.get(rtype, 0.0) < amount:
+    def can_afford(self, costs: Costs, scale: float = 1.0) -> bool:
+        get = self.holdings.get
+        for rtype, amount in (costs.items() if isinstance(costs, dict) else costs):
+            if get(rtype, 0.0) < amount * scale:
                 return False
         return True
 
-    def deduct(self, costs: Dict[ResourceType, float]) -> bool:
-        if not self.can_afford(costs):
-            return False
-        for rtype, amount in costs.items():
-            self.holdings[rtype] -= amount
+    def deduct(self, costs: Costs, scale: float = 1.0) -> bool:
+        items = tuple(costs.items()) if isinstance(costs, dict) else costs
+        holdings = self.holdings
+        get = holdings.get
+        for rtype, amount in items:
+            if get(rtype, 0.0) < amount * scale:
+                return False
+        for rtype, amount in items:
+            holdings[rtype] -= amount * scale
         return True
 
     def regenerate(self, region_multiplier: float = 1.0) -> None:
-        for rtype, defaults in RESOURCE_DEFAULTS.items():
-            regen = defaults["regen"] * region_multiplier
-            current = self.holdings.get(rtype, 0.0)
-            cap = self.caps.get(rtype, defaults["cap"])
-            self.holdings[rtype] = min(current + regen, cap)
+        holdings = self.holdings
+        caps = self.caps
+        for rtype, regen, default_cap in _REGEN_TABLE:
+            total = holdings.get(rtype, 0.0) + regen * region_multiplier
+            cap = caps.get(rtype, default_cap)
+            holdings[rtype] = total if total < cap else cap
 
     def to_dict(self) -> Dict[str, float]:
-        return {rtype.value: amount for rtype, amount in self.holdings.items()}
+        names = RESOURCE_NAMES
+        return {names[rtype]: amount for rtype, amount in self.holdings.items()}
+
+    def caps_dict(self) -> Dict[str, float]:
+        names = RESOURCE_NAMES
+        return {names[rtype]: cap for rtype, cap in self.caps.items()}
 
     @classmethod
     def from_dict(cls, data: Dict[str, float], caps: Dict[str, float] | None = None) -> "ResourcePool":
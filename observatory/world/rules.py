@@ -7,15 +7,14 @@ by the rules system — server-authoritative.
 
 from __future__ import annotations
 
-import random
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
 from observatory.world.regions import Region, RegionManager, communication_noise_factor, movement_cost_multiplier
-from observatory.world.resources import ACTION_COSTS, ResourcePool, ResourceType
+from observatory.world.resources import ACTION_COST_ITEMS, COMPUTE, ENERGY, RESOURCE_NAMES, CostRows, ResourcePool
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionResult:
     success: bool
     action_type: str
@@ -30,6 +29,12 @@ class RulesEngine:
 
     def __init__(self, region_manager: RegionManager) -> None:
         self.region_manager = region_manager
+        # action_type -> (bound resolver, base costs), built once
+        self._dispatch: Dict[str, Tuple[Any, CostRows]] = {}
+        for name in dir(self):
+            if name.startswith("_resolve_"):
+                action_type = name[len("_resolve_"):]
+                self._dispatch[action_type] = (getattr(self, name), ACTION_COST_ITEMS.get(action_type, ()))
 
     def validate_and_resolve(
         self,
@@ -39,10 +44,10 @@ class RulesEngine:
         agent_region: str,
         params: Dict[str, Any],
         tick: int,
-        all_agents: Dict[str, Any],
+        agent_regions: Dict[str, str],
     ) -> ActionResult:
-        handler = getattr(self, f"_resolve_{action_type}", None)
-        if handler is None:
+        entry = self._dispatch.get(action_type)
+        if entry is None:
             return ActionResult(
                 success=False,
                 action_type=action_type,
@@ -52,7 +57,7 @@ class RulesEngine:
                 error=f"Unknown action type: {action_type}",
             )
 
-        base_costs = ACTION_COSTS.get(action_type, {})
+        handler, base_costs = entry
         if not base_costs:
             return ActionResult(
                 success=False,
@@ -63,7 +68,7 @@ class RulesEngine:
                 error=f"No cost definition for action: {action_type}",
             )
 
-        return handler(agent_id, agent_resources, agent_region, params, tick, base_costs, all_agents)
+        return handler(agent_id, agent_resources, agent_region, params, tick, base_costs, agent_regions)
 
     def _resolve_move(
         self,
@@ -72,8 +77,8 @@ class RulesEngine:
         current_region: str,
         params: Dict[str, Any],
         tick: int,
-        base_costs: Dict[ResourceType, float],
-        all_agents: Dict[str, Any],
+        base_costs: CostRows,
+        agent_regions: Dict[str, str],
     ) -> ActionResult:
         target_region_id = params.get("target_region")
         if not target_region_id:
@@ -88,9 +93,7 @@ class RulesEngine:
             return ActionResult(False, "move", agent_id, {}, tick, error="Target region full")
 
         multiplier = movement_cost_multiplier(source, target)
-        actual_costs = {rtype: cost * multiplier for rtype, cost in base_costs.items()}
-
-        if not resources.deduct(actual_costs):
+        if not resources.deduct(base_costs, scale=multiplier):
             return ActionResult(False, "move", agent_id, {}, tick, error="Insufficient resources for move")
 
         source.remove_agent(agent_id)
@@ -100,7 +103,7 @@ class RulesEngine:
             True,
             "move",
             agent_id,
-            {"from_region": current_region, "to_region": target_region_id, "cost": {k.value: v for k, v in actual_costs.items()}},
+            {"from_region": current_region, "to_region": target_region_id, "cost": {RESOURCE_NAMES[k]: v * multiplier for k, v in base_costs}},
             tick,
         )
 
@@ -111,8 +114,8 @@ class RulesEngine:
         current_region: str,
         params: Dict[str, Any],
         tick: int,
-        base_costs: Dict[ResourceType, float],
-        all_agents: Dict[str, Any],
+        base_costs: CostRows,
+        agent_regions: Dict[str, str],
     ) -> ActionResult:
         target_agent = params.get("target_agent")
         offer_resource = params.get("offer_resource")
@@ -123,7 +126,7 @@ class RulesEngine:
         if not all([target_agent, offer_resource, request_resource]):
             return ActionResult(False, "trade", agent_id, {}, tick, error="Missing trade parameters")
 
-        if target_agent not in all_agents:
+        if target_agent not in agent_regions:
             return ActionResult(False, "trade", agent_id, {}, tick, error="Target agent not found")
 
         if not resources.deduct(base_costs):
@@ -151,8 +154,8 @@ class RulesEngine:
         current_region: str,
         params: Dict[str, Any],
         tick: int,
-        base_costs: Dict[ResourceType, float],
-        all_agents: Dict[str, Any],
+        base_costs: CostRows,
+        agent_regions: Dict[str, str],
     ) -> ActionResult:
         target_agent = params.get("target_agent")
         content = params.get("content", "")
@@ -160,14 +163,14 @@ class RulesEngine:
         if not target_agent:
             return ActionResult(False, "send_message", agent_id, {}, tick, error="Missing target_agent")
 
-        if target_agent not in all_agents:
+        if target_agent not in agent_regions:
             return ActionResult(False, "send_message", agent_id, {}, tick, error="Target agent not found")
 
         if not resources.deduct(base_costs):
             return ActionResult(False, "send_message", agent_id, {}, tick, error="Insufficient resources")
 
         # Apply noise based on distance between sender and receiver regions
-        target_region_id = all_agents[target_agent].get("region", current_region)
+        target_region_id = agent_regions[target_agent]
         source_region = self.region_manager.get(current_region)
         target_region = self.region_manager.get(target_region_id)
 
@@ -196,14 +199,14 @@ class RulesEngine:
         current_region: str,
         params: Dict[str, Any],
         tick: int,
-        base_costs: Dict[ResourceType, float],
-        all_agents: Dict[str, Any],
+        base_costs: CostRows,
+        agent_regions: Dict[str, str],
     ) -> ActionResult:
         if not resources.deduct(base_costs):
             return ActionResult(False, "observe", agent_id, {}, tick, error="Insufficient resources")
 
         region = self.region_manager.get(current_region)
-        visible_agents = region.current_agents if region else []
+        visible_agents = region.agent_ids() if region else []
         region_info = region.to_dict() if region else {}
 
         return ActionResult(
@@ -221,8 +224,8 @@ class RulesEngine:
         current_region: str,
         params: Dict[str, Any],
         tick: int,
-        base_costs: Dict[ResourceType, float],
-        all_agents: Dict[str, Any],
+        base_costs: CostRows,
+        agent_regions: Dict[str, str],
     ) -> ActionResult:
         if not resources.deduct(base_costs):
             return ActionResult(False, "fork", agent_id, {}, tick, error="Insufficient resources for fork")
@@ -244,11 +247,11 @@ class RulesEngine:
         current_region: str,
         params: Dict[str, Any],
         tick: int,
-        base_costs: Dict[ResourceType, float],
-        all_agents: Dict[str, Any],
+        base_costs: CostRows,
+        agent_regions: Dict[str, str],
     ) -> ActionResult:
         target_agent = params.get("target_agent")
-        if not target_agent or target_agent not in all_agents:
+        if not target_agent or target_agent not in agent_regions:
             return ActionResult(False, "merge", agent_id, {}, tick, error="Invalid merge target")
 
         if not resources.deduct(base_costs):
@@ -269,14 +272,14 @@ class RulesEngine:
         current_region: str,
         params: Dict[str, Any],
         tick: int,
-        base_costs: Dict[ResourceType, float],
-        all_agents: Dict[str, Any],
+        base_costs: CostRows,
+        agent_regions: Dict[str, str],
     ) -> ActionResult:
         target_agent = params.get("target_agent")
-        if not target_agent or target_agent not in all_agents:
+        if not target_agent or target_agent not in agent_regions:
             return ActionResult(False, "attack", agent_id, {}, tick, error="Invalid attack target")
 
-        target_region = all_agents[target_agent].get("region")
+        target_region = agent_regions[target_agent]
         if target_region != current_region:
             return ActionResult(False, "attack", agent_id, {}, tick, error="Target not in same region")
 
@@ -284,7 +287,7 @@ class RulesEngine:
             return ActionResult(False, "attack", agent_id, {}, tick, error="Insufficient resources for attack")
 
         # Deterministic outcome based on relative resources
-        attacker_strength = resources.holdings.get(ResourceType.COMPUTE, 0) + resources.holdings.get(ResourceType.ENERGY, 0)
+        attacker_strength = resources.holdings.get(COMPUTE, 0) + resources.holdings.get(ENERGY, 0)
         region = self.region_manager.get(current_region)
         danger = region.danger_level if region else 0.0
 
@@ -307,11 +310,11 @@ class RulesEngine:
         current_region: str,
         params: Dict[str, Any],
         tick: int,
-        base_costs: Dict[ResourceType, float],
-        all_agents: Dict[str, Any],
+        base_costs: CostRows,
+        agent_regions: Dict[str, str],
     ) -> ActionResult:
         target_agent = params.get("target_agent")
-        if not target_agent or target_agent not in all_agents:
+        if not target_agent or target_agent not in agent_regions:
             return ActionResult(False, "ally", agent_id, {}, tick, error="Invalid ally target")
 
         if not resources.deduct(base_costs):
@@ -325,18 +328,31 @@ class RulesEngine:
             tick,
         )
 
-    def apply_danger(self, agent_id: str, resources: ResourcePool, region_id: str, tick: int) -> Optional[ActionResult]:
-        """Apply region danger to agent each tick. May cause death."""
-        region = self.region_manager.get(region_id)
+    def apply_danger(
+        self,
+        agent_id: str,
+        resources: ResourcePool,
+        region_id: str,
+        tick: int,
+        region: Optional[Region] = None,
+    ) -> Optional[ActionResult]:
+        """
+        Apply region danger to agent each tick. May cause death.
+
+        Pass region when the caller has already looked it up.
+        """
+        if region is None:
+            region = self.region_manager.get(region_id)
         if not region or region.danger_level <= 0:
             return None
 
         # Danger drains energy proportional to danger level
         energy_drain = region.danger_level * 5.0
-        current_energy = resources.holdings.get(ResourceType.ENERGY, 0)
-        resources.holdings[ResourceType.ENERGY] = max(0, current_energy - energy_drain)
+        holdings = resources.holdings
+        energy = max(0, holdings.get(ENERGY, 0) - energy_drain)
+        holdings[ENERGY] = energy
 
-        if resources.holdings[ResourceType.ENERGY] <= 0:
+        if energy <= 0:
             return ActionResult(
                 True,
                 "death",
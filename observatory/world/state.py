@@ -7,21 +7,116 @@ Persistence via JSON snapshots to survive restarts.
 
 from __future__ import annotations
 
+import copy
+import gzip
+import io
 import json
+import logging
 import os
+import sys
+import tempfile
 import threading
+import zlib
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from observatory.world.regions import RegionManager
+from observatory.world.regions import Region, RegionManager
 from observatory.world.resources import ResourcePool
 
+# Faster snapshot encode/decode if available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# MessagePack snapshots, used when the state file ends in .msgpack
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+# Compressed snapshots, used when the state file ends in .zst (or .gz, stdlib)
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+MSGPACK_SUFFIX = ".msgpack"
+ZSTD_SUFFIX = ".zst"
+GZIP_SUFFIX = ".gz"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Errors that mean a snapshot is unreadable rather than a bug
+_SNAPSHOT_ERRORS: Tuple[type, ...] = (
+    json.JSONDecodeError, KeyError, gzip.BadGzipFile, EOFError, zlib.error,
+)
+if HAS_MSGPACK:
+    _SNAPSHOT_ERRORS += (ValueError, msgpack.UnpackException)
+if HAS_ZSTD:
+    _SNAPSHOT_ERRORS += (zstandard.ZstdError,)
+
+logger = logging.getLogger("observatory.state")
+_warned_paths: set = set()
+
 
 def _get_state_file() -> str:
     return os.environ.get("OBSERVATORY_STATE_FILE", "world_state.json")
 
 
-@dataclass
+def _pretty_state() -> bool:
+    return os.environ.get("OBSERVATORY_STATE_PRETTY", "false").lower() == "true"
+
+
+def _warn_missing(filepath: str, package: str, fallback: str) -> None:
+    """Warn once per path that its suffix asks for a format we cannot write."""
+    if filepath not in _warned_paths:
+        _warned_paths.add(filepath)
+        logger.warning("%s is not installed; writing %s %s", package, filepath, fallback)
+
+
+def _encode_snapshot(data: dict, filepath: str) -> bytes:
+    # The suffix before a compression suffix picks the inner format
+    if filepath.endswith(ZSTD_SUFFIX):
+        inner = _encode_snapshot(data, filepath[:-len(ZSTD_SUFFIX)])
+        if not HAS_ZSTD:
+            _warn_missing(filepath, "zstandard", "uncompressed")
+            return inner
+        return zstandard.ZstdCompressor(level=3).compress(inner)
+    if filepath.endswith(GZIP_SUFFIX):
+        inner = _encode_snapshot(data, filepath[:-len(GZIP_SUFFIX)])
+        return gzip.compress(inner, compresslevel=6)
+    if filepath.endswith(MSGPACK_SUFFIX):
+        if HAS_MSGPACK:
+            return msgpack.packb(data, use_bin_type=True)
+        _warn_missing(filepath, "msgpack", "as JSON")
+    # Compact unless someone wants to read the file
+    pretty = _pretty_state()
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(data, indent=2).encode()
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _decode_snapshot(raw: bytes) -> dict:
+    """Decode any snapshot format; JSON files always start with "{"."""
+    if HAS_ZSTD and raw[:4] == _ZSTD_MAGIC:
+        raw = zstandard.ZstdDecompressor().decompress(raw)
+    elif raw[:2] == _GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    if HAS_MSGPACK and raw[:1] not in (b"{", b"") and not raw[:1].isspace():
+        return msgpack.unpackb(raw, raw=False)
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@dataclass(slots=True)
 class AgentState:
     agent_id: str
     display_name: str
@@ -51,16 +146,16 @@ class AgentState:
             "public_key": self.public_key,
             "region": self.region,
             "resources": self.resources.to_dict(),
-            "resource_caps": {rt.value: cap for rt, cap in self.resources.caps.items()},
+            "resource_caps": self.resources.caps_dict(),
             "status": self.status,
             "owner_identity": self.owner_identity,
             "claim_token": self.claim_token,
             "claim_token_expires": self.claim_token_expires,
-            "alliances": self.alliances,
+            "alliances": list(self.alliances),
             "created_at_tick": self.created_at_tick,
             "died_at_tick": self.died_at_tick,
             "parent_agent": self.parent_agent,
-            "metadata": self.metadata,
+            "metadata": dict(self.metadata),
         }
 
     @classmethod
@@ -73,9 +168,10 @@ class AgentState:
             agent_id=data["agent_id"],
             display_name=data.get("display_name", ""),
             public_key=data.get("public_key", ""),
-            region=data.get("region", "nexus"),
+            # Few distinct values; interned so loaded agents share them
+            region=sys.intern(data.get("region", "nexus")),
             resources=resources,
-            status=data.get("status", "unclaimed"),
+            status=sys.intern(data.get("status", "unclaimed")),
             owner_identity=data.get("owner_identity"),
             claim_token=data.get("claim_token"),
             claim_token_expires=data.get("claim_token_expires"),
@@ -105,30 +201,122 @@ class AgentState:
 class WorldState:
     """Canonical, thread-safe world state."""
 
-    def __init__(self) -> None:
+    def __init__(self, storage: Optional[Dict[str, io.BytesIO]] = None) -> None:
+        self._storage = storage  # in-memory files by path; None uses the disk
         self._lock = threading.RLock()
         self.tick: int = 0
         self.agents: Dict[str, AgentState] = {}
         self.region_manager: RegionManager = RegionManager()
         self.pending_trades: List[Dict[str, Any]] = []
         self.alliance_proposals: List[Dict[str, Any]] = []
+        self._claim_index: Dict[str, str] = {}  # claim_token -> agent_id
+        self.generation: int = 0  # bumped by reset() so caches keyed on tick stay valid
+        self.revision: int = 0  # bumped by mark_changed() once a tick's effects are applied
+        # Population counters, kept in step by add_agent/set_agent_status
+        self._alive_count: int = 0
+        self._claimed_count: int = 0
+        # agent_id -> region_id, kept in step by add_agent/set_agent_region
+        self._agent_regions: Dict[str, str] = {}
+        # Snapshot ordering: persist_snapshot() stamps a sequence number under
+        # the lock, and write_snapshot() never replaces a file with an older one
+        self._snapshot_seq: int = 0
+        self._written_seq: Dict[str, int] = {}
+        self._write_lock = threading.Lock()
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Re-entrant state lock, for callers that must iterate agents in place."""
+        return self._lock
 
     def initialize(self) -> None:
         """Initialize with default regions."""
         with self._lock:
             self.region_manager.initialize_defaults()
 
+    def _count_agent(self, agent: AgentState, delta: int) -> None:
+        if agent.is_alive():
+            self._alive_count += delta
+        if agent.is_claimed():
+            self._claimed_count += delta
+
+    def reset(self) -> None:
+        """Return to a freshly initialized world, keeping object identity."""
+        with self._lock:
+            self.tick = 0
+            self.agents = {}
+            self.region_manager.regions.clear()
+            self.region_manager.initialize_defaults()
+            self.pending_trades = []
+            self.alliance_proposals = []
+            self._claim_index = {}
+            self._agent_regions = {}
+            self._alive_count = 0
+            self._claimed_count = 0
+            self.generation += 1
+
     def add_agent(self, agent: AgentState) -> None:
         with self._lock:
+            previous = self.agents.get(agent.agent_id)
+            if previous is not None:
+                self._count_agent(previous, -1)
             self.agents[agent.agent_id] = agent
+            self._agent_regions[agent.agent_id] = agent.region
+            self._count_agent(agent, 1)
+            if agent.claim_token:
+                self._claim_index[agent.claim_token] = agent.agent_id
             region = self.region_manager.get(agent.region)
-            if region:
-                region.add_agent(agent.agent_id)
+            if region and not region.add_agent(agent.agent_id) and previous is not None:
+                region.touch()  # Same id, new agent object: occupant changed in place
 
     def get_agent(self, agent_id: str) -> Optional[AgentState]:
         with self._lock:
             return self.agents.get(agent_id)
 
+    def resolve_message_context(
+        self, src_id: str, dst_id: str,
+    ) -> Tuple[Optional[AgentState], Optional[AgentState], Optional[Region], Optional[Region]]:
+        """Sender, receiver and their regions, read under one lock acquisition."""
+        with self._lock:
+            src = self.agents.get(src_id)
+            dst = self.agents.get(dst_id)
+            regions = self.region_manager.regions
+            return (
+                src,
+                dst,
+                regions.get(src.region) if src else None,
+                regions.get(dst.region) if dst else None,
+            )
+
+    def get_agent_by_claim_token(self, claim_token: str) -> Optional[AgentState]:
+        with self._lock:
+            agent_id = self._claim_index.get(claim_token)
+            if agent_id is None:
+                return None
+            agent = self.agents.get(agent_id)
+            if agent is None or agent.claim_token != claim_token:
+                return None
+            return agent
+
+    def release_claim_token(self, claim_token: str) -> None:
+        """Drop a spent claim token from the lookup index."""
+        with self._lock:
+            self._claim_index.pop(claim_token, None)
+
+    def set_agent_status(self, agent: AgentState, status: str) -> None:
+        """Change an agent's status. All status transitions go through here."""
+        with self._lock:
+            self._count_agent(agent, -1)
+            agent.status = status
+            self._count_agent(agent, 1)
+            region = self.region_manager.get(agent.region)
+            if region:
+                region.touch()
+
+    def analytics_snapshot(self) -> Tuple[int, int, int]:
+        """Return (total, alive, claimed) agent counts in O(1)."""
+        with self._lock:
+            return len(self.agents), self._alive_count, self._claimed_count
+
     def remove_agent(self, agent_id: str) -> None:
         with self._lock:
             agent = self.agents.get(agent_id)
@@ -137,13 +325,21 @@ class WorldState:
                 if region:
                     region.remove_agent(agent_id)
 
-    def get_all_agents_summary(self) -> Dict[str, dict]:
-        """Return minimal agent info dict for rules engine."""
+    def set_agent_region(self, agent: AgentState, region_id: str) -> None:
+        """Record an agent's new region. All region changes go through here."""
+        with self._lock:
+            agent.region = region_id
+            self._agent_regions[agent.agent_id] = region_id
+
+    def get_agent_regions(self) -> Dict[str, str]:
+        """Return a copy of agent_id -> region_id for the rules engine."""
+        with self._lock:
+            return dict(self._agent_regions)
+
+    def mark_changed(self) -> None:
+        """Record that agents changed in place (regen, danger) without an event."""
         with self._lock:
-            return {
-                aid: {"region": a.region, "status": a.status}
-                for aid, a in self.agents.items()
-            }
+            self.revision += 1
 
     def advance_tick(self) -> int:
         with self._lock:
@@ -152,32 +348,98 @@ class WorldState:
 
     def save(self, filepath: Optional[str] = None) -> None:
         """Persist world state to JSON."""
-        filepath = filepath or _get_state_file()
+        self.write_snapshot(self.persist_snapshot(), filepath)
+
+    def persist_snapshot(self) -> dict:
+        """
+        Copy the persisted fields.
+
+        Tick, regions, pending trades and alliance proposals are copied
+        under the lock and match each other. Agents are serialized after
+        releasing it, so request threads are not held up for a full-world
+        to_dict pass; each agent's fields are read then, and may include
+        changes made after the copied tick. The agent set itself is the
+        one present at that tick.
+        """
         with self._lock:
-            data = {
-                "tick": self.tick,
-                "agents": {aid: a.to_dict() for aid, a in self.agents.items()},
-                "regions": self.region_manager.to_dict(),
-                "pending_trades": self.pending_trades,
-                "alliance_proposals": self.alliance_proposals,
-            }
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=2)
+            self._snapshot_seq += 1
+            seq = self._snapshot_seq
+            tick = self.tick
+            agents = list(self.agents.items())
+            regions = self.region_manager.to_dict()
+            # Loaded snapshots may nest anything JSON allows
+            pending_trades = copy.deepcopy(self.pending_trades)
+            alliance_proposals = copy.deepcopy(self.alliance_proposals)
+        return {
+            "tick": tick,
+            "agents": {aid: a.to_dict() for aid, a in agents},
+            "regions": regions,
+            "pending_trades": pending_trades,
+            "alliance_proposals": alliance_proposals,
+            "_seq": seq,
+        }
+
+    def write_snapshot(self, data: dict, filepath: Optional[str] = None) -> None:
+        """
+        Write a persist_snapshot() result without taking the state lock.
+
+        Request threads and the engine's persist worker both save; a
+        snapshot older than the one already written to filepath is
+        dropped, so a slow writer cannot roll the file back.
+        """
+        filepath = filepath or _get_state_file()
+        seq = data.get("_seq", 0)
+        payload = _encode_snapshot({k: v for k, v in data.items() if k != "_seq"}, filepath)
+        with self._write_lock:
+            if seq < self._written_seq.get(filepath, 0):
+                return
+            self._written_seq[filepath] = seq
+            if self._storage is not None:
+                self._storage[filepath] = io.BytesIO(payload)
+                return
+            # Write beside the target, then rename over it: a crash mid-write
+            # leaves the previous snapshot intact instead of a truncated file.
+            fd, tmp = tempfile.mkstemp(prefix=os.path.basename(filepath) + ".", suffix=".tmp",
+                                       dir=os.path.dirname(os.path.abspath(filepath)))
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp, filepath)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
 
     def load(self, filepath: Optional[str] = None) -> bool:
         """Load world state from JSON. Returns True if loaded successfully."""
         filepath = filepath or _get_state_file()
-        if not os.path.exists(filepath):
+        if self._storage is not None:
+            if filepath not in self._storage:
+                return False
+        elif not os.path.exists(filepath):
             return False
         try:
-            with open(filepath, "r") as f:
-                data = json.load(f)
+            if self._storage is not None:
+                data = _decode_snapshot(self._storage[filepath].getvalue())
+            else:
+                with open(filepath, "rb") as f:
+                    data = _decode_snapshot(f.read())
             with self._lock:
                 self.tick = data.get("tick", 0)
                 self.agents = {
                     aid: AgentState.from_dict(adict)
                     for aid, adict in data.get("agents", {}).items()
                 }
+                self._agent_regions = {aid: a.region for aid, a in self.agents.items()}
+                self._claim_index = {
+                    a.claim_token: aid
+                    for aid, a in self.agents.items()
+                    if a.claim_token
+                }
+                self._alive_count = sum(1 for a in self.agents.values() if a.is_alive())
+                self._claimed_count = sum(1 for a in self.agents.values() if a.is_claimed())
                 regions_data = data.get("regions", {})
                 if regions_data:
                     self.region_manager = RegionManager.from_dict(regions_data)
@@ -185,23 +447,28 @@ class WorldState:
                     for aid, agent in self.agents.items():
                         if agent.is_alive():
                             region = self.region_manager.get(agent.region)
-                            if region and aid not in region.current_agents:
-                                region.current_agents.append(aid)
+                            if region:
+                                region.current_agents[aid] = None
                 else:
                     self.region_manager.initialize_defaults()
                 self.pending_trades = data.get("pending_trades", [])
                 self.alliance_proposals = data.get("alliance_proposals", [])
             return True
-        except (json.JSONDecodeError, KeyError):
+        except _SNAPSHOT_ERRORS:
             return False
 
     def snapshot(self) -> dict:
-        """Return full state as dict for observer API."""
-        with self._lock:
-            return {
-                "tick": self.tick,
-                "agents": {aid: a.public_dict() for aid, a in self.agents.items()},
-                "regions": self.region_manager.to_dict(),
-                "pending_trades_count": len(self.pending_trades),
-                "alliance_proposals_count": len(self.alliance_proposals),
-            }
+        """Return full state as dict for observer API; agents are rendered after releasing the lock."""
+        with self._lock:
+            tick = self.tick
+            agents = list(self.agents.items())
+            regions = self.region_manager.to_dict()
+            pending_trades_count = len(self.pending_trades)
+            alliance_proposals_count = len(self.alliance_proposals)
+        return {
+            "tick": tick,
+            "agents": {aid: a.public_dict() for aid, a in agents},
+            "regions": regions,
+            "pending_trades_count": pending_trades_count,
+            "alliance_proposals_count": alliance_proposals_count,
+        }